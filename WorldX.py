@@ -1,21 +1,51 @@
 import tkinter as tk
 from tkinter import messagebox
-import json
 import os
-import random
-import subprocess
-import shutil
+import zlib
 from datetime import datetime
+from worldx_history import HistoryStore, format_entry
+from worldx_settings import SettingsWriter, load_settings
+from worldx_library import LibraryCatalog, QuarantineView, ContrabandScanner, TitleIndex
+from worldx_tasks import UiQueue
+from worldx_fileops import FileOpEngine
+from worldx_widgets import ReviewDialog, ProgressDialog, VirtualGrid, LazyListView
+from worldx_classify import FileClassifier, LEGAL_VIDEO, LEGAL_GAMES
+from worldx_mp4 import MediaIndex, describe, tv_rows, TV_SORTS, TV_FILTERS
+from worldx_launcher import GameLauncher, LauncherBusy
+from worldx_perf import perf, PERF_FILE
 
 # --- CONFIGURATION ---
 VIDEO_FOLDER = "worldx_tv"
 GAME_FOLDER = "worldx_games"
 TRASH_FOLDER = "worldx_trash"
 SETTINGS_FILE = "settings.json"
+HISTORY_DB = "worldx_history.db"
+SETTINGS_FLUSH_MS = 500
+CATALOG_FILE = "worldx_catalog.json"
+CATALOG_POLL_MS = 3000
+CATALOG_RECENT_S = 600  # every poll also stats the files modified this recently (may still be being written)
+SIGNATURE_FILE = "worldx_signatures.json"
+MEDIA_FILE = "worldx_media.json"
+MEDIA_WORKERS = 2
 
-# Approved Extensions
-LEGAL_VIDEO = [".mp4"]
-LEGAL_GAMES = [".py", ".exe", ".url", ".lnk"]
+# Game launcher: cap on games running at once (None = no cap). The fork server pre-warms a Python
+# interpreter so .py games start faster; opt in with WORLDX_FORK_SERVER=1 (not available on Windows).
+GAME_MAX_RUNNING = None
+FILEOP_WORKERS = 4
+GAME_FORK_SERVER = os.environ.get("WORLDX_FORK_SERVER") == "1"
+QUARANTINE_SEARCH_MS = 150
+
+# Address bar suggestions while typing
+ADDR_SUGGEST_MS = 80
+ADDR_SUGGESTIONS = 8
+
+# History retention (None = keep forever)
+HISTORY_MAX_ROWS = 1000000
+HISTORY_MAX_AGE_DAYS = None
+
+# History row colors by action type
+HISTORY_COLORS = {"achievement": "#BC13FE", "quarantine": "#ff8800", "delete": "#cc0000",
+                  "restore": "#00aa00", "launch": "#0055ff", "session": "#0055ff"}
 
 for folder in [VIDEO_FOLDER, GAME_FOLDER, TRASH_FOLDER]:
     if not os.path.exists(folder):
@@ -36,59 +66,97 @@ class WorldXApp:
         self.font_small = (self.font_name, 9, "bold")
         
         self.neon_colors = ["#39FF14", "#FF007F", "#00FFFF", "#FFFF00", "#FF5F1F", "#BC13FE"]
+        self.history = HistoryStore(HISTORY_DB)
+        self.settings_writer = SettingsWriter(SETTINGS_FILE, SETTINGS_FLUSH_MS, self.root.after)
+        self.root.protocol("WM_DELETE_WINDOW", self.shutdown)
+        self.tasks = UiQueue(self.root)
+        self.catalog = LibraryCatalog([VIDEO_FOLDER, GAME_FOLDER, TRASH_FOLDER], CATALOG_FILE)
+        self.classifier = FileClassifier(SIGNATURE_FILE)
+        self.scanner = ContrabandScanner(self.catalog, self.classifier)
+        self.media = MediaIndex(MEDIA_FILE, MEDIA_WORKERS)
+        self.tv_sort, self.tv_filter, self.tv_redraw = "NAME", "ALL", None
+        self.tv_cache = (None, [], {})  # (what the rows were built from, [(entry, metadata)], {name: metadata})
+        self.grid_captions, self.grid_index = {}, {}
+        self.launcher = GameLauncher(lambda event, s: self.tasks.post(self.game_event, event, s),
+                                     GAME_MAX_RUNNING, GAME_FORK_SERVER)
+        self.launcher.warm_up()
+        self.fileops = FileOpEngine(FILEOP_WORKERS)
+        self.scans_running = set()
+        self.reviews, self.grid_hidden = {}, set()
+        self.station, self.station_grid = None, None
+        self.root.after(CATALOG_POLL_MS, self.watch_folders)
+        self.q_view = QuarantineView(self.catalog, TRASH_FOLDER)
+        self.q_after = None
+        self.titles = TitleIndex(self.catalog, {"TV": (VIDEO_FOLDER, LEGAL_VIDEO), "GAME": (GAME_FOLDER, LEGAL_GAMES)})
+        self.addr_after, self.addr_hits = None, []
         self.settings = self.load_settings()
+        if "history" in self.settings: self.migrate_history()
+        else: self.history.compact(HISTORY_MAX_ROWS, HISTORY_MAX_AGE_DAYS)
         self.sort_newest = True
         
         self.main_container = tk.Frame(self.root, bg="#d9d9d9")
         self.main_container.pack(fill="both", expand=True)
         self.draw_hub()
 
+    @perf.span("settings.load")
     def load_settings(self):
-        # --- EXPANDED ACHIEVEMENTS LIST ---
-        # The list is defined here, but the display will reverse it so the bottom ones appear on top
-        default_achievements = {
-            "GAMES!!!": False,
-            "TV!!!": False,
-            "I'M A GOOFY GOOBER": False,
-            "YOU'RE UNDER ARREST FOR TRAFFICKING ILLEGAL FILES!!!": False,
-            "NOOB!!!": False,
-            "GARBAGE DAY!!!": False,
-            "IT'S ALIVE!!!": False,
-            "BYE BYE!!!": False,
-            "STALKER!!!": False,
-            "ARE YOU LOST???": False,
-            "COVERING YOUR TRACKS!!!": False,
-            "SORT IT OUT!!!": False,
-            "DOUBLE CLICK!!!": False
-        }
-
-        if not os.path.exists(SETTINGS_FILE):
-            default = {
-                "tutorial_completed": False, 
-                "history": [],
-                "achievements": default_achievements
-            }
-            with open(SETTINGS_FILE, "w") as f: json.dump(default, f, indent=4)
-            return default
-        try:
-            with open(SETTINGS_FILE, "r") as f:
-                data = json.load(f)
-                if "history" not in data: data["history"] = []
-                # Merge new achievements if they don't exist in old save file
-                if "achievements" not in data: data["achievements"] = {}
-                for k, v in default_achievements.items():
-                    if k not in data["achievements"]:
-                        data["achievements"][k] = v
-                return data
-        except: return {"tutorial_completed": False, "history": [], "achievements": default_achievements}
+        return load_settings(SETTINGS_FILE, self.settings_writer)
+
+    def migrate_history(self):
+        # Old save files kept history inline. A big list takes seconds to import, so it runs on a
+        # worker; the list stays in settings.json until the import has committed
+        legacy, title = self.settings["history"] or [], self.root.title()
+        self.history.hold()
+        def progress(done, total):
+            self.tasks.post(self.root.title, f"{title} (importing history {done * 100 // max(1, total)}%)")
+        def done(n):
+            self.root.title(title)
+            self.history.release()
+            self.settings.pop("history", None)
+            self.save_settings()
+            self.history.compact(HISTORY_MAX_ROWS, HISTORY_MAX_AGE_DAYS)
+        def failed(e):
+            self.root.title(title)
+            self.history.release()
+            messagebox.showerror("ERROR", f"Could not import old history: {e}")
+        self.tasks.run(lambda: self.history.migrate_legacy(legacy, progress), done, failed)
 
     def save_settings(self):
-        with open(SETTINGS_FILE, "w") as f: json.dump(self.settings, f, indent=4)
+        # Marks settings dirty; the writer coalesces bursts into one atomic write
+        perf.count("settings.save")
+        self.settings_writer.save(self.settings)
+
+    def watch_folders(self):
+        # Polls on a worker so a slow folder never stalls the UI
+        self.tasks.run(lambda: self.catalog.poll(recent_ns=CATALOG_RECENT_S * 10**9), self.folders_changed, lambda e: self.folders_changed([]))
 
-    def add_to_history(self, action):
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.settings["history"].append(f"[{now}] {action}")
-        self.save_settings()
+    def folders_changed(self, diffs):
+        for d in diffs:
+            if self.station_showing(d.folder):
+                self.show_station(d.folder, keep_scroll=True)
+                self.check_for_contraband(d.folder, LEGAL_VIDEO if d.folder == VIDEO_FOLDER else LEGAL_GAMES)
+        self.root.after(CATALOG_POLL_MS, self.watch_folders)
+
+    def shutdown(self):
+        # Every step runs even if an earlier one fails (e.g. a full disk), and the window always closes
+        library = lambda: [(os.path.join(f, e.name), e.size, e.mtime_ns, e.ino)
+                           for f in (VIDEO_FOLDER, GAME_FOLDER, TRASH_FOLDER) for e in self.catalog.entries(f, refresh=False).values()]
+        steps = [self.fileops.shutdown, self.settings_writer.flush, self.catalog.save,
+                 lambda: self.classifier.retain(library()), self.classifier.save,
+                 self.media.shutdown, lambda: self.media.retain(self.catalog.entries(VIDEO_FOLDER, refresh=False).values()),
+                 self.media.save, self.launcher.close, self.history.close, perf.flush]
+        errors = []
+        try:
+            for step in steps:
+                try: step()
+                except Exception as e: errors.append(e)
+            if errors: messagebox.showerror("ERROR", "Some WorldX data could not be saved:\n" + "\n".join(map(str, errors)))
+        finally:
+            self.root.destroy()
+
+    @perf.span("history.append")
+    def add_to_history(self, action, kind=None, subject=None):
+        self.history.append(action, kind, subject)
 
     def unlock_achievement(self, name):
         if self.settings.get("achievements") and not self.settings["achievements"].get(name):
@@ -98,69 +166,178 @@ class WorldXApp:
             messagebox.showinfo("ACHIEVEMENT UNLOCKED!", f"🏆 {name}")
 
     def check_for_contraband(self, folder, allowed_exts):
-        """Scans for illegal files. If found, asks the user to move them to Quarantine."""
-        all_files = os.listdir(folder)
-        for f in list(all_files):
-            ext = os.path.splitext(f)[1].lower()
-            if ext not in allowed_exts:
-                self.unlock_achievement("YOU'RE UNDER ARREST FOR TRAFFICKING ILLEGAL FILES!!!")
-                
-                msg = (f"SECURITY ALERT!\n\nThe file '{f}' is ILLEGAL in this section.\n"
-                       "Do you want to move it to Quarantine?")
-                
-                if messagebox.askyesno("ILLEGAL FILE DETECTED", msg):
-                    try:
-                        src = os.path.join(folder, f)
-                        dst = os.path.join(TRASH_FOLDER, f)
-                        if os.path.exists(dst):
-                            base, extension = os.path.splitext(f)
-                            timestamp = datetime.now().strftime("%H%M%S")
-                            dst = os.path.join(TRASH_FOLDER, f"{base}_{timestamp}{extension}")
-                        shutil.move(src, dst)
-                        self.add_to_history(f"Quarantined illegal file: {f}")
-                        messagebox.showinfo("SUCCESS", f"File '{f}' has been quarantined.")
-                    except Exception as e:
-                        messagebox.showerror("ERROR", f"Could not move file: {e}")
+        """Scans for illegal files in the background, then offers them all for Quarantine in one window."""
+        if folder in self.scans_running: return
+        self.scans_running.add(folder)
+        def done(result):
+            self.scans_running.discard(folder)
+            diff, illegal = result
+            # Redraw when the folder changed or the set of hidden (illegal) cards did
+            if (diff or {e.name for e in illegal} != self.grid_hidden) and self.station_showing(folder): self.show_station(folder, keep_scroll=True)
+            if not illegal: return
+            review = self.reviews.get(folder)
+            if review is not None and review.winfo_exists(): return
+            self.unlock_achievement("YOU'RE UNDER ARREST FOR TRAFFICKING ILLEGAL FILES!!!")
+            msg = (f"SECURITY ALERT!\n\n{len(illegal)} ILLEGAL file(s) found in this section.\n"
+                   "Select the ones you want to move to Quarantine.")
+            self.reviews[folder] = ReviewDialog(self.root, "ILLEGAL FILES DETECTED", msg, [e.name for e in illegal],
+                                                lambda chosen, dlg: self.quarantine_files(folder, chosen, dlg), self.font_main, self.font_small)
+        def failed(e):
+            self.scans_running.discard(folder)
+            messagebox.showerror("ERROR", f"Could not scan {folder}: {e}")
+        def scan():
+            with perf.span("contraband.scan", folder=folder):
+                return self.scanner.scan(folder, allowed_exts)
+        self.tasks.run(scan, done, failed)
+
+    def quarantine_files(self, folder, names, dlg):
+        def finished(batch):
+            moved = [os.path.basename(src) for src, dst in batch.moved]
+            if len(moved) == 1: self.add_to_history(f"Quarantined illegal file: {moved[0]}")
+            elif moved: self.add_to_history(f"Quarantined {len(moved)} illegal files from {folder}", "quarantine", folder)
+            if moved and not batch.errors: messagebox.showinfo("SUCCESS", f"{len(moved)} file(s) have been quarantined.")
+        self.run_file_batch("QUARANTINE", [("move", os.path.join(folder, n), TRASH_FOLDER) for n in names], finished, dlg)
+
+    def run_file_batch(self, title, ops, finished, dlg=None):
+        """Runs file ops on the engine's thread pool with a progress window. finished(batch) runs on the
+        main thread afterwards, with all of its history/achievement updates saved as one settings write."""
+        batch = None
+        if dlg is None: dlg = ProgressDialog(self.root, title, len(ops), lambda: batch.cancel(), self.font_small)
+        else: dlg.set_cancel(lambda: batch.cancel())
+        def done(b):
+            for folder in [VIDEO_FOLDER, GAME_FOLDER, TRASH_FOLDER]: self.catalog.invalidate(folder)
+            if dlg.winfo_exists(): dlg.destroy()
+            with self.settings_writer.batch(): finished(b)
+            if b.errors:
+                messagebox.showerror("ERROR", f"{len(b.errors)} file(s) failed:\n" + "\n".join(f"{os.path.basename(p)}: {e}" for p, e in b.errors[:10]))
+            self.refresh_quarantine()
+        batch = self.fileops.submit(ops, lambda d, t: self.tasks.post(dlg.set_progress, d, t), lambda b: self.tasks.post(done, b))
 
     # --- STATIONS ---
     def draw_tv(self):
         self.unlock_achievement("TV!!!")
         self.add_to_history("Accessed TV Station")
+        self.show_tv()
         self.check_for_contraband(VIDEO_FOLDER, LEGAL_VIDEO)
-        for w in self.content_area.winfo_children(): w.destroy()
-        tk.Label(self.content_area, text="TV STATION", font=self.font_header, fg="red", bg="#d9d9d9").pack()
-        files = [f for f in os.listdir(VIDEO_FOLDER) if f.lower().endswith(".mp4")]
-        self.create_grid(files, "TV", lambda x: os.startfile(os.path.join(VIDEO_FOLDER, x)))
 
     def draw_games(self):
         self.unlock_achievement("GAMES!!!")
         self.add_to_history("Accessed Game Station")
+        self.show_games()
         self.check_for_contraband(GAME_FOLDER, LEGAL_GAMES)
+
+    # Drawn from the cached catalog; the background scan redraws if the folder turned out to have changed
+    @perf.span("station.tv")
+    def show_tv(self, keep_scroll=False):
+        start = self.station_grid.canvas.yview()[0] if keep_scroll and self.station_showing(VIDEO_FOLDER) else 0.0
+        for w in self.content_area.winfo_children(): w.destroy()
+        tk.Label(self.content_area, text="TV STATION", font=self.font_header, fg="red", bg="#d9d9d9").pack()
+        ctrl_f = tk.Frame(self.content_area, bg="#d9d9d9"); ctrl_f.pack(pady=5)
+        tk.Button(ctrl_f, text=f"SORT: {self.tv_sort}", bg="#808080", fg="white", font=self.font_small, command=self.cycle_tv_sort).pack(side="left", padx=5)
+        tk.Button(ctrl_f, text=f"FILTER: {self.tv_filter}", bg="#808080", fg="white", font=self.font_small, command=self.cycle_tv_filter).pack(side="left", padx=5)
+        # Files the scanner found illegal (e.g. a renamed .exe posing as .mp4) don't get a card
+        self.grid_hidden = self.scanner.flagged_names(VIDEO_FOLDER)
+        # Rows are only rebuilt (and re-sorted) when the files, the probe results or the view changed
+        key = (self.catalog.version(VIDEO_FOLDER), self.media.version, self.tv_sort, self.tv_filter, frozenset(self.grid_hidden))
+        if key != self.tv_cache[0]:
+            entries = [e for e in self.catalog.entries(VIDEO_FOLDER, refresh=False).values()
+                       if e.ext in LEGAL_VIDEO and e.name not in self.grid_hidden]
+            # Cards show what's already in the media index; the rest fill in as the probe pool gets to them
+            self.media.request(VIDEO_FOLDER, entries, lambda e, info: self.tasks.post(self.media_ready, e, info))
+            rows = tv_rows(entries, self.media, self.tv_sort, self.tv_filter)
+            self.tv_cache = (key, rows, {e.name: m or {"size": e.size} for e, m in rows})
+        key, rows, info = self.tv_cache
+        # Captions are made as cards scroll into view
+        self.create_grid([e.name for e, m in rows], "TV", lambda x: os.startfile(os.path.join(VIDEO_FOLDER, x)),
+                         lambda name: describe(info[name]), start)
+        self.station = VIDEO_FOLDER
+
+    def cycle_tv_sort(self):
+        keys = list(TV_SORTS); self.tv_sort = keys[(keys.index(self.tv_sort) + 1) % len(keys)]; self.show_tv()
+
+    def cycle_tv_filter(self):
+        keys = list(TV_FILTERS); self.tv_filter = keys[(keys.index(self.tv_filter) + 1) % len(keys)]; self.show_tv()
+
+    def media_ready(self, entry, info):
+        if not self.station_showing(VIDEO_FOLDER): return
+        if entry.name in self.grid_index:
+            self.grid_captions[entry.name] = describe(info)
+            self.station_grid.refresh_item(self.grid_index[entry.name])
+        if (self.tv_sort != "NAME" or self.tv_filter != "ALL") and not self.media.busy():
+            # Order depends on the new data: re-sort once, after the last pending probe
+            if not self.tv_redraw: self.tv_redraw = self.root.after(100, self.redraw_tv)
+
+    def redraw_tv(self):
+        self.tv_redraw = None
+        if self.station_showing(VIDEO_FOLDER): self.show_tv(keep_scroll=True)
+
+    @perf.span("station.games")
+    def show_games(self, keep_scroll=False):
+        start = self.station_grid.canvas.yview()[0] if keep_scroll and self.station_showing(GAME_FOLDER) else 0.0
         for w in self.content_area.winfo_children(): w.destroy()
         tk.Label(self.content_area, text="GAME STATION", font=self.font_header, fg="green", bg="#d9d9d9").pack()
-        files = [f for f in os.listdir(GAME_FOLDER) if f.lower().endswith(tuple(LEGAL_GAMES))]
-        self.create_grid(files, "PLAY", self.run_game)
+        self.grid_hidden = self.scanner.flagged_names(GAME_FOLDER)
+        files = [f for f in self.catalog.files(GAME_FOLDER, LEGAL_GAMES, refresh=False) if f not in self.grid_hidden]
+        self.create_grid(files, "PLAY", self.run_game, start=start)
+        self.station = GAME_FOLDER
+
+    def station_showing(self, folder):
+        return self.station == folder and self.station_grid is not None and self.station_grid.winfo_exists()
+
+    def show_station(self, folder, keep_scroll=False):
+        # keep_scroll: a redraw of what's already showing (files changed), not a visit
+        if folder == VIDEO_FOLDER: self.show_tv(keep_scroll)
+        elif folder == GAME_FOLDER: self.show_games(keep_scroll)
 
     # --- HISTORY SECTION ---
     def draw_history(self):
         self.unlock_achievement("STALKER!!!")
         for w in self.content_area.winfo_children(): w.destroy()
         tk.Label(self.content_area, text="HISTORY", font=self.font_header, bg="#d9d9d9", fg="#444444").pack(pady=10)
+        ctrl_f = tk.Frame(self.content_area, bg="#d9d9d9"); ctrl_f.pack(fill="x", padx=40)
+        tk.Label(ctrl_f, text="FIND:", font=self.font_small, bg="#d9d9d9").pack(side="left")
+        self.h_search = tk.Entry(ctrl_f, font=self.font_list, width=18); self.h_search.pack(side="left", padx=5)
+        self.h_search.bind("<Return>", lambda e: self.find_in_history())
+        tk.Button(ctrl_f, text="FIND NEXT", bg="#808080", fg="white", font=self.font_small, command=self.find_in_history).pack(side="left")
+        tk.Button(ctrl_f, text="GO", bg="#808080", fg="white", font=self.font_small, command=self.jump_in_history).pack(side="right")
+        self.h_jump = tk.Entry(ctrl_f, font=self.font_list, width=18); self.h_jump.pack(side="right", padx=5)
+        self.h_jump.bind("<Return>", lambda e: self.jump_in_history())
+        tk.Label(ctrl_f, text="JUMP TO (YYYY-MM-DD HH:MM):", font=self.font_small, bg="#d9d9d9").pack(side="right")
         list_frame = tk.Frame(self.content_area, bg="white", relief="sunken", borderwidth=2)
         list_frame.pack(fill="both", expand=True, padx=40, pady=10)
-        lb = tk.Listbox(list_frame, font=self.font_list, bg="white", borderwidth=0)
-        lb.pack(side="left", fill="both", expand=True)
-        sb = tk.Scrollbar(list_frame); sb.pack(side="right", fill="y")
-        lb.config(yscrollcommand=sb.set); sb.config(command=lb.yview)
-        # Reverse History (Newest on top)
-        for entry in reversed(self.settings.get("history", [])): lb.insert(tk.END, entry)
+        # Newest on top; only the rows on screen are ever fetched from the store
+        fetch = lambda offset, limit: [(format_entry(r), HISTORY_COLORS.get(r[2])) for r in self.history.page(offset, limit)]
+        self.hist_view = LazyListView(list_frame, fetch, self.history.count, self.font_list)
+        self.hist_view.pack(fill="both", expand=True)
         tk.Button(self.content_area, text="CLEAR HISTORY", bg="#808080", fg="white", font=self.font_small, command=self.clear_history_data).pack(pady=10)
 
+    def find_in_history(self):
+        query = self.h_search.get().strip()
+        if not query: return
+        sel = self.hist_view.lb.curselection()
+        start = self.hist_view.top + (sel[0] + 1 if sel else 0)
+        found = self.history.find(query, start)
+        if found is None and start: found = self.history.find(query, 0)
+        if found is None: messagebox.showinfo("HISTORY", f"'{query}' not found."); return
+        self.hist_view.scroll_to(found, select=True)
+
+    def jump_in_history(self):
+        text = self.h_jump.get().strip()
+        for fmt, pad in (("%Y-%m-%d %H:%M:%S", 0), ("%Y-%m-%d %H:%M", 59), ("%Y-%m-%d", 86399)):
+            try: ts = datetime.strptime(text, fmt).timestamp() + pad; break
+            except ValueError: continue
+        else:
+            messagebox.showerror("HISTORY", "Use YYYY-MM-DD or YYYY-MM-DD HH:MM"); return
+        self.hist_view.scroll_to(self.history.offset_at_time(ts), select=True)
+
     def clear_history_data(self):
+        if self.history.migrating:
+            messagebox.showinfo("WorldX", "Still importing your old history, try again in a moment.")
+            return
         if messagebox.askyesno("WorldX", "Clear all history logs?"):
-            self.settings["history"] = []
+            self.history.clear()
             self.unlock_achievement("COVERING YOUR TRACKS!!!")
-            self.save_settings(); self.draw_history()
+            self.draw_history()
 
     # --- QUARANTINE MANAGER ---
     def draw_quarantine(self):
@@ -181,14 +358,14 @@ class WorldXApp:
         tk.Button(btn_frame, text="EMPTY TRASH", bg="red", fg="white", font=self.font_small, command=self.empty_trash).pack(side="left", padx=5)
         tk.Button(btn_frame, text="RESTORE SELECTED", bg="blue", fg="white", font=self.font_small, command=self.restore_file).pack(side="left", padx=5)
         tk.Button(btn_frame, text="RESTORE ALL", bg="#00aa00", fg="white", font=self.font_small, command=self.restore_all).pack(side="left", padx=5)
+        tk.Button(btn_frame, text="FIND DUPLICATES", bg="#BC13FE", fg="white", font=self.font_small, command=self.find_duplicates).pack(side="left", padx=5)
 
+    @perf.span("quarantine.update_list")
     def update_q_list(self, filter_text=""):
+        # Served from the cached stat table; only rebuilt when the trash folder changes
+        files = self.q_view.query(filter_text, self.sort_newest)
         self.trash_list.delete(0, tk.END)
-        files = [(f, os.path.getmtime(os.path.join(TRASH_FOLDER, f))) for f in os.listdir(TRASH_FOLDER)]
-        if self.sort_newest: files.sort(key=lambda x: x[1], reverse=True)
-        else: files.sort(key=lambda x: x[0].lower())
-        for f, t in files:
-            if filter_text.lower() in f.lower(): self.trash_list.insert(tk.END, f)
+        if files: self.trash_list.insert(tk.END, *files)
         self.sort_btn.config(text="SORT: NEWEST" if self.sort_newest else "SORT: A-Z")
 
     def toggle_sort(self): 
@@ -196,13 +373,20 @@ class WorldXApp:
         self.unlock_achievement("SORT IT OUT!!!")
         self.update_q_list(self.q_search.get())
         
-    def filter_quarantine(self, event): self.update_q_list(self.q_search.get())
+    def filter_quarantine(self, event):
+        # Debounced: typing a word runs one search, not one per key
+        if self.q_after: self.root.after_cancel(self.q_after)
+        self.q_after = self.root.after(QUARANTINE_SEARCH_MS, self.run_q_search)
+
+    def run_q_search(self):
+        self.q_after = None
+        if self.q_search.winfo_exists(): self.update_q_list(self.q_search.get())
     
     def delete_single_file(self):
         try:
             sel = self.trash_list.get(self.trash_list.curselection())
             if messagebox.askyesno("WorldX", f"Delete {sel} forever?"):
-                os.remove(os.path.join(TRASH_FOLDER, sel))
+                os.remove(os.path.join(TRASH_FOLDER, sel)); self.catalog.invalidate(TRASH_FOLDER)
                 self.unlock_achievement("BYE BYE!!!")
                 self.add_to_history(f"Deleted forever: {sel}")
                 self.draw_quarantine()
@@ -210,26 +394,69 @@ class WorldXApp:
 
     def empty_trash(self):
         if messagebox.askyesno("WorldX", "Wipe all Quarantine files?"):
-            for f in os.listdir(TRASH_FOLDER): os.remove(os.path.join(TRASH_FOLDER, f))
-            self.unlock_achievement("GARBAGE DAY!!!")
-            self.add_to_history("Emptied Quarantine Trash"); self.draw_quarantine()
+            def finished(batch):
+                if not batch.deleted: return
+                if batch.cancelled or batch.errors:
+                    self.add_to_history(f"Deleted forever {len(batch.deleted)} of {batch.total} quarantined files", "delete")
+                    return
+                self.unlock_achievement("GARBAGE DAY!!!")
+                self.add_to_history("Emptied Quarantine Trash")
+            ops = [("delete", os.path.join(TRASH_FOLDER, f)) for f in self.catalog.entries(TRASH_FOLDER)]
+            self.run_file_batch("EMPTY TRASH", ops, finished)
 
     def restore_file(self):
-        try:
-            sel = self.trash_list.get(self.trash_list.curselection())
-            dst = VIDEO_FOLDER if sel.lower().endswith(".mp4") else GAME_FOLDER
-            shutil.move(os.path.join(TRASH_FOLDER, sel), os.path.join(dst, sel))
+        try: sel = self.trash_list.get(self.trash_list.curselection())
+        except tk.TclError: return
+        def finished(batch):
+            if not batch.moved: return
             self.unlock_achievement("IT'S ALIVE!!!")
             self.unlock_achievement("DOUBLE CLICK!!!")
-            self.add_to_history(f"Restored: {sel}"); self.draw_quarantine()
-        except: pass
+            self.add_to_history(f"Restored: {sel}")
+        self.run_file_batch("RESTORE", [("move", os.path.join(TRASH_FOLDER, sel), self.restore_target)], finished)
+
+    def restore_target(self, path):
+        # Routed by what the file really is, not what its name says (runs on a file engine worker)
+        try: kind = self.classifier.kind(path)
+        except OSError: kind = None
+        return VIDEO_FOLDER if kind == "mp4" else GAME_FOLDER
+
+    def refresh_quarantine(self):
+        if getattr(self, "trash_list", None) is not None and self.trash_list.winfo_exists():
+            self.update_q_list(self.q_search.get())
+
+    def find_duplicates(self):
+        folders = [VIDEO_FOLDER, GAME_FOLDER, TRASH_FOLDER]
+        def work():
+            files = [(os.path.join(folder, e.name), e.size, e.mtime_ns, e.ino)
+                     for folder in folders for e in self.catalog.entries(folder).values()]
+            sizes = {f[0]: f[1] for f in files}
+            # Keep the first copy of each group (library before quarantine), offer the rest
+            extras = [p for group in self.classifier.find_duplicates(files) for p in group[1:]]
+            return extras, sum(sizes[p] for p in extras)
+        def done(result):
+            extras, reclaim = result
+            if not extras:
+                messagebox.showinfo("DUPLICATES", "No duplicate files found."); return
+            msg = f"{len(extras)} duplicate copies found ({reclaim / 1048576:.1f} MB). One copy of each file is kept."
+            ReviewDialog(self.root, "DUPLICATES", msg, extras, self.delete_duplicates, self.font_main, self.font_small,
+                         action_text="DELETE SELECTED")
+        self.tasks.run(work, done, lambda e: messagebox.showerror("ERROR", f"Duplicate scan failed: {e}"))
+
+    def delete_duplicates(self, paths, dlg):
+        def finished(batch):
+            if batch.deleted: self.add_to_history(f"Deleted {len(batch.deleted)} duplicate files", "delete")
+        self.run_file_batch("DUPLICATES", [("delete", p) for p in paths], finished, dlg)
 
     def restore_all(self):
-        for f in os.listdir(TRASH_FOLDER):
-            src, dest = os.path.join(TRASH_FOLDER, f), (VIDEO_FOLDER if f.lower().endswith(".mp4") else GAME_FOLDER)
-            shutil.move(src, os.path.join(dest, f))
-        self.unlock_achievement("IT'S ALIVE!!!")
-        self.add_to_history("Restored all quarantined files"); self.draw_quarantine()
+        def finished(batch):
+            if not batch.moved: return
+            self.unlock_achievement("IT'S ALIVE!!!")
+            if batch.cancelled or batch.errors:
+                self.add_to_history(f"Restored {len(batch.moved)} of {batch.total} quarantined files", "restore")
+            else:
+                self.add_to_history(f"Restored all quarantined files ({len(batch.moved)})", "restore")
+        ops = [("move", os.path.join(TRASH_FOLDER, f), self.restore_target) for f in self.catalog.entries(TRASH_FOLDER)]
+        self.run_file_batch("RESTORE ALL", ops, finished)
 
     # --- NAVIGATION ---
     def draw_hub(self):
@@ -247,25 +474,104 @@ class WorldXApp:
         tk.Label(addr_f, text="ADDRESS:", bg=nav_bg, fg="white", font=self.font_small).pack(side="left")
         self.addr = tk.Entry(addr_f, font=self.font_list); self.addr.pack(side="left", fill="x", expand=True, padx=5)
         self.addr.bind("<Return>", self.handle_addr)
+        self.addr.bind("<KeyRelease>", self.addr_typed)
+        self.addr.bind("<Down>", lambda e: self.addr_hits and (self.addr_list.focus_set(), self.addr_list.selection_set(0)))
+        self.addr.bind("<Escape>", lambda e: self.hide_suggestions())
         tk.Button(addr_f, text="GO", bg="#ffff00", font=self.font_small, command=self.handle_addr).pack(side="left")
 
         self.content_area = tk.Frame(self.main_container, bg="#d9d9d9"); self.content_area.pack(fill="both", expand=True)
+        # Suggestion dropdown, floated under the address bar over whatever page is showing
+        self.addr_list = tk.Listbox(self.main_container, font=self.font_list, height=ADDR_SUGGESTIONS, activestyle="none")
+        self.addr_list.bind("<ButtonRelease-1>", lambda e: self.pick_suggestion())
+        self.addr_list.bind("<Return>", lambda e: self.pick_suggestion())
+        self.addr_list.bind("<Escape>", lambda e: (self.hide_suggestions(), self.addr.focus_set()))
         tk.Label(self.content_area, text="WORLDX HUB", font=self.font_header, bg="#d9d9d9", fg="#0055ff").pack(pady=100)
         if not self.settings.get("tutorial_completed", False): self.show_tutorial()
 
     def handle_addr(self, e=None):
         cmd = self.addr.get().upper().strip()
+        self.hide_suggestions()
         if cmd in ["TUTORIAL", "TUT"]: 
             self.unlock_achievement("NOOB!!!")
             self.show_tutorial()
         elif cmd == "CREDITS":
             self.unlock_achievement("I'M A GOOFY GOOBER")
             messagebox.showinfo("CREDITS", "WorldX Created by goofygoober1942")
+        elif cmd.split()[:1] == ["PERF"]:
+            self.perf_command(cmd.split()[1:])
         else:
-            self.unlock_achievement("ARE YOU LOST???")
+            hit = self.titles.resolve(cmd)
+            if hit and not self.is_flagged(*hit): self.open_title(*hit)
+            else: self.unlock_achievement("ARE YOU LOST???")
         
         self.addr.delete(0, tk.END)
 
+    def perf_command(self, args):
+        # PERF toggles timing, PERF DUMP shows the summary, PERF RESET clears it
+        if not args:
+            perf.enable(not perf.enabled)
+            messagebox.showinfo("PERF", f"Timing {'ON, writing ' + PERF_FILE if perf.enabled else 'OFF'}")
+        elif args == ["DUMP"]:
+            perf.flush()
+            win = tk.Toplevel(self.root); win.title("PERF SUMMARY"); win.transient(self.root)
+            text = tk.Text(win, font=("Courier", 10), width=80, height=24)
+            report = perf.format_summary() if perf.summary() else "No spans yet. Type PERF to turn timing on."
+            # Launch-to-ready is tracked whether or not PERF is on, so the fork server can be compared
+            launches = self.launcher.stats()
+            if launches:
+                report += "\n\nGAME LAUNCH TO READY (ms)\n" + "\n".join(
+                    f"{mode:<28}{st['launches']:>7}{st['mean_ms']:>9.2f}  best {st['best_ms']:.2f}" for mode, st in launches.items())
+            # So are settings writes: how many saves the debounce folded away
+            writes = self.settings_writer.stats()
+            report += "\n\nSETTINGS WRITES (this session)\n" + "\n".join(f"{name:<28}{n:>7}" for name, n in writes.items())
+            text.insert("1.0", report)
+            text.config(state="disabled"); text.pack(fill="both", expand=True)
+        elif args == ["RESET"]:
+            perf.reset()
+        else:
+            self.unlock_achievement("ARE YOU LOST???")
+
+    def is_flagged(self, section, name):
+        # Files waiting on a contraband review stay out of the address bar like they do the grids
+        return name in self.scanner.flagged_names(VIDEO_FOLDER if section == "TV" else GAME_FOLDER)
+
+    def open_title(self, section, name):
+        if section == "GAME":
+            self.run_game(name)
+            return
+        try: os.startfile(os.path.join(VIDEO_FOLDER, name))
+        except OSError as e: messagebox.showerror("ERROR", f"Could not open {name}: {e}"); return
+        self.add_to_history(f"Opened {name} from the address bar")
+
+    # --- ADDRESS BAR SUGGESTIONS ---
+    def addr_typed(self, e):
+        if e.keysym in ("Return", "Escape", "Down", "Up"): return
+        if self.addr_after: self.root.after_cancel(self.addr_after)
+        self.addr_after = self.root.after(ADDR_SUGGEST_MS, self.show_suggestions)
+
+    def show_suggestions(self):
+        self.addr_after = None
+        self.addr_hits = [hit for hit in self.titles.suggest(self.addr.get(), ADDR_SUGGESTIONS) if not self.is_flagged(*hit)]
+        if not self.addr_hits: self.hide_suggestions(); return
+        self.addr_list.delete(0, tk.END)
+        self.addr_list.insert(tk.END, *[f"{section} {name}" for section, name in self.addr_hits])
+        self.addr_list.config(height=len(self.addr_hits))
+        self.addr_list.place(in_=self.addr, x=0, rely=1, relwidth=1)
+        self.addr_list.lift()
+
+    def hide_suggestions(self):
+        if self.addr_after: self.root.after_cancel(self.addr_after); self.addr_after = None
+        self.addr_hits = []
+        self.addr_list.place_forget()
+
+    def pick_suggestion(self):
+        sel = self.addr_list.curselection()
+        if not sel or sel[0] >= len(self.addr_hits): return
+        hit = self.addr_hits[sel[0]]
+        self.hide_suggestions()
+        self.addr.delete(0, tk.END)
+        if not self.is_flagged(*hit): self.open_title(*hit)
+
     def draw_achievements(self):
         self.add_to_history("Checked Achievement Board")
         for w in self.content_area.winfo_children(): w.destroy()
@@ -277,33 +583,30 @@ class WorldXApp:
         list_frame = tk.Frame(self.content_area, bg="white", relief="sunken", borderwidth=2)
         list_frame.pack(fill="both", expand=True, padx=40, pady=10)
         
-        lb = tk.Listbox(list_frame, font=self.font_list, bg="white", borderwidth=0)
-        lb.pack(side="left", fill="both", expand=True)
-        
-        sb = tk.Scrollbar(list_frame)
-        sb.pack(side="right", fill="y")
-        
-        lb.config(yscrollcommand=sb.set)
-        sb.config(command=lb.yview)
-        
-        # Get Dictionary items
-        ach_list = list(self.settings.get("achievements", {}).items())
-        
         # REVERSE ORDER (Like History: Newest defined stuff at the top)
-        for i, (name, unlocked) in enumerate(reversed(ach_list)):
-            status = " [UNLOCKED]" if unlocked else " [LOCKED]"
-            display_text = f"{name}{status}"
-            lb.insert(tk.END, display_text)
-            
-            # Keep the Green/Gray color coding
-            color = "#00aa00" if unlocked else "#555555"
-            lb.itemconfigure(i, fg=color)
+        ach_list = list(reversed(self.settings.get("achievements", {}).items()))
+        
+        # Keep the Green/Gray color coding
+        def fetch(offset, limit):
+            return [(f"{name}{' [UNLOCKED]' if unlocked else ' [LOCKED]'}", "#00aa00" if unlocked else "#555555")
+                    for name, unlocked in ach_list[offset:offset + limit]]
+        LazyListView(list_frame, fetch, lambda: len(ach_list), self.font_list).pack(fill="both", expand=True)
 
     def run_game(self, gm):
-        self.add_to_history(f"Launched Game: {gm}")
         path = os.path.join(GAME_FOLDER, gm)
-        if gm.lower().endswith(".py"): subprocess.Popen(["python", path], shell=True)
-        else: os.startfile(path)
+        try: session = self.launcher.launch(path, gm)
+        except LauncherBusy as e: messagebox.showerror("WorldX", f"Too many games open!\n{e}"); return
+        except OSError as e: messagebox.showerror("ERROR", f"Could not launch {gm}: {e}"); return
+        # Tracked games are logged once they're ready (with their startup time)
+        if session is None: self.add_to_history(f"Launched Game: {gm}")
+
+    def game_event(self, event, s):
+        via = "fork server" if s.mode == "fork" else "new interpreter"
+        if event == "ready":
+            self.add_to_history(f"Launched Game: {s.name} (ready in {s.ready_s * 1000:.0f} ms, {via})", "launch", s.name)
+        else:
+            m, sec = divmod(int(s.duration_s), 60)
+            self.add_to_history(f"Game closed: {s.name} after {m}m {sec:02d}s (exit code {s.exit_code})", "session", s.name)
 
     def show_tutorial(self):
         self.add_to_history("Started Tutorial")
@@ -332,13 +635,29 @@ class WorldXApp:
     def finish_tutorial(self): 
         self.settings["tutorial_completed"] = True; self.save_settings(); self.tut_overlay.destroy(); self.add_to_history("Finished Tutorial")
 
-    def create_grid(self, files, btn_text, action):
-        grid = tk.Frame(self.content_area, bg="#f0f0f0"); grid.pack(fill="both", expand=True, padx=20)
-        for i, f in enumerate(files):
-            card = tk.Frame(grid, bg="#d9d9d9", width=200, height=160, relief="raised", borderwidth=3)
-            card.grid(row=i//3, column=i%3, padx=15, pady=15); card.pack_propagate(0)
-            tk.Button(card, text=btn_text, bg=random.choice(self.neon_colors), font=(self.font_name, 16, "bold"), command=lambda x=f: action(x)).pack(fill="both", expand=True)
-            tk.Label(card, text=f, font=self.font_small, bg="#d9d9d9").pack()
+    def card_color(self, name):
+        # Same neon for the same file on every redraw
+        return self.neon_colors[zlib.crc32(name.encode("utf-8", "replace")) % len(self.neon_colors)]
+
+    @perf.span("station.create_grid")
+    def create_grid(self, files, btn_text, action, caption=None, start=0.0):
+        # Only the cards on screen exist; they get re-filled as you scroll. caption(name) gives the
+        # line under the name; grid_captions holds newer ones (probe results that came in meanwhile)
+        self.grid_captions = {}
+        self.grid_index = {f: i for i, f in enumerate(files)}
+        def make_card(parent):
+            card = tk.Frame(parent, bg="#d9d9d9", width=200, height=160, relief="raised", borderwidth=3); card.pack_propagate(0)
+            card.btn = tk.Button(card, text=btn_text, font=(self.font_name, 16, "bold")); card.btn.pack(fill="both", expand=True)
+            card.label = tk.Label(card, font=self.font_small, bg="#d9d9d9", wraplength=190); card.label.pack()
+            return card
+        def bind_card(card, i):
+            f = files[i]
+            card.btn.config(bg=self.card_color(f), command=lambda: action(f))
+            text = self.grid_captions.get(f) or (caption(f) if caption else None)
+            card.label.config(text=f"{f}\n{text}" if text else f)
+        grid = VirtualGrid(self.content_area, make_card, bind_card, len(files), start=start)
+        grid.pack(fill="both", expand=True, padx=20)
+        self.station_grid = grid
 
 if __name__ == "__main__":
     r = tk.Tk(); app = WorldXApp(r); r.mainloop()
\ No newline at end of file
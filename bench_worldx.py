@@ -0,0 +1,265 @@
+"""Headless benchmarks for WorldX's hot paths (everything that doesn't need Tk).
+
+    python bench_worldx.py                           # 10k files, 100k history entries
+    python bench_worldx.py --full                    # 100k files, 1M history entries
+    python bench_worldx.py --json base.json          # save the results
+    python bench_worldx.py --compare base.json       # exit 1 if a case got slower than --threshold
+
+Fixtures are generated in a temp folder from a fixed seed, so two runs on the same machine measure
+the same work. WorldX.py itself is never imported: it creates its folders on import and needs a display.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from worldx_classify import FileClassifier, LEGAL_VIDEO, LEGAL_GAMES
+from worldx_history import HistoryStore, TIME_FORMAT
+from worldx_launcher import GameLauncher
+from worldx_library import LibraryCatalog, ContrabandScanner, QuarantineView, TitleIndex
+from worldx_mp4 import MediaIndex, describe, tv_rows, TV_SORTS
+from worldx_perf import Perf
+from worldx_settings import SettingsWriter, load_settings
+from worldx_widgets import grid_window
+
+WORDS = "mario zelda space invaders night ocean city dragon star wars tour alpha omega retro turbo".split()
+MP4_HEAD = b"\x00\x00\x00\x18ftypisom\x00\x00\x02\x00isomiso2" + b"\x00\x00\x00\x08free"
+PE_HEAD = b"MZ\x90\x00" + b"\x00" * 60
+ACTIONS = ["Restored: {}", "Quarantined illegal file: {}", "Launched Game: {}", "Deleted forever: {}",
+           "Accessed TV Station", "Opened Quarantine Manager", "ACHIEVEMENT UNLOCKED: {}"]
+
+
+# --- FIXTURES ---
+def title(rng, i):
+    return f"{rng.choice(WORDS)} {rng.choice(WORDS)} {1900 + i % 125} ep{i}"
+
+
+def make_library(root, n_files, seed):
+    """TV / games / trash folders with ~10% illegal files: wrong extensions and lying contents."""
+    rng = random.Random(seed)
+    folders = {k: os.path.join(root, k) for k in ("tv", "games", "trash")}
+    for f in folders.values(): os.makedirs(f)
+    for i in range(n_files):
+        r = rng.random()
+        folder = folders["tv"] if r < 0.6 else folders["games"] if r < 0.9 else folders["trash"]
+        illegal = rng.random() < 0.1
+        if folder == folders["tv"]:
+            ext, body = (rng.choice([".avi", ".exe", ".mp4"]), PE_HEAD) if illegal else (".mp4", MP4_HEAD)
+        else:
+            kind = rng.choice(LEGAL_GAMES)
+            body = {".py": b"print('hi')\n", ".exe": PE_HEAD, ".url": b"[InternetShortcut]\nURL=x\n",
+                    ".lnk": b"\x4c\x00\x00\x00\x01\x14\x02\x00\x00\x00\x00\x00\xc0\x00\x00\x00\x00\x00\x00\x46"}[kind]
+            ext = rng.choice([".zip", ".bat"]) if illegal else kind
+            if illegal and rng.random() < 0.5: ext, body = ".py", PE_HEAD
+        # Some exact duplicates so the duplicate finder has real work
+        if rng.random() < 0.05: body += b"dup" * 10
+        else: body += rng.randbytes(rng.randint(16, 2048))
+        with open(os.path.join(folder, title(rng, i) + ext), "wb") as f: f.write(body)
+    return folders
+
+
+def make_settings(path, n_history, seed):
+    """An old-style settings.json with the history still inline (the format migrate_legacy reads)."""
+    rng = random.Random(seed)
+    t0 = time.mktime(time.strptime("2024-01-01 00:00:00", TIME_FORMAT))
+    history = [f"[{time.strftime(TIME_FORMAT, time.localtime(t0 + i * 30))}] "
+               + rng.choice(ACTIONS).format(title(rng, i) + ".mp4") for i in range(n_history)]
+    data = {"tutorial_completed": True, "achievements": {w.upper() + "!!!": rng.random() < 0.5 for w in WORDS},
+            "history": history}
+    with open(path, "w", encoding="utf-8") as f: json.dump(data, f)
+
+
+# --- BENCH CASES ---
+class Bench:
+    def __init__(self):
+        self.perf = Perf(path=None, enabled=True)
+
+    def time(self, name, fn, repeat=1, setup=None):
+        """Runs fn repeat times (setup before each, untimed) and records every run under name."""
+        result = None
+        for _ in range(repeat):
+            if setup: setup()
+            with self.perf.span(name): result = fn()
+        return result
+
+
+def bench_history(b, root, settings_path, rng):
+    # Startup as WorldX does it: parse + merge new achievements, and the first-run write
+    writer = SettingsWriter(os.path.join(root, "settings.json"))
+    data = b.time("settings.load", lambda: load_settings(settings_path, writer), 3)
+    b.time("settings.load_first_run", lambda: load_settings(writer.path, writer), 5,
+           setup=lambda: os.path.exists(writer.path) and os.remove(writer.path))
+    entries = data.pop("history")
+    store = HistoryStore(os.path.join(root, "history.db"))
+    b.time("history.migrate_legacy", lambda: store.migrate_legacy(entries))
+    b.time("history.count_cold", store.count, 5, setup=lambda: setattr(store, "span", None))
+    for i in range(1000):
+        b.time("history.append", lambda: store.append(f"Restored: bench {i}.mp4"))
+    n = store.count()
+    for _ in range(1000):
+        offset = rng.randrange(n)
+        b.time("history.page", lambda: store.page(offset, 40))
+    for word in ("ep12345", "bench 999", "no such entry"):
+        b.time("history.find", lambda: store.find(word), 3)
+    store.close()
+
+    def burst():
+        with writer.batch():
+            for i in range(100):
+                data["achievements"]["BURST!!!"] = bool(i % 2)
+                writer.save(data)
+    b.time("settings.save_burst", burst, 20)
+
+
+def bench_library(b, root, folders, rng):
+    folder_list = list(folders.values())
+    catalog = LibraryCatalog(folder_list, os.path.join(root, "catalog.json"))
+    b.time("catalog.cold_scan", lambda: [catalog.refresh(f, force=True) for f in folder_list], 3,
+           setup=lambda: [catalog.folders[f].update(entries={}, mtime_ns=None) for f in folder_list])
+    b.time("catalog.poll_unchanged", catalog.poll, 50)
+    # Every fixture file was just written, so this stats all of them: the worst case for the app's poll
+    b.time("catalog.poll_recent_worst", lambda: catalog.poll(recent_ns=600 * 10**9), 10)
+    def touch():
+        for i in range(max(1, len(catalog.entries(folders["tv"], refresh=False)) // 100)):
+            with open(os.path.join(folders["tv"], f"new {rng.random()}.mp4"), "wb") as f: f.write(MP4_HEAD)
+    b.time("catalog.rescan_1pct_changed", lambda: catalog.refresh(folders["tv"], force=True), 3, setup=touch)
+    catalog.dirty = True
+    b.time("catalog.save", lambda: (setattr(catalog, "dirty", True), catalog.save()), 3)
+    b.time("catalog.load", lambda: LibraryCatalog(folder_list, catalog.cache_path), 3)
+
+    classifier = FileClassifier()
+    scanner = ContrabandScanner(catalog, classifier)
+    def rewrite_a_few(folder):
+        # A station revisit after some files changed in place: only those get sniffed again
+        entries = list(catalog.entries(folder, refresh=False).values())
+        for e in rng.sample(entries, min(5, len(entries))):
+            path = os.path.join(folder, e.name)
+            os.utime(path, ns=(e.mtime_ns + 1000000000, e.mtime_ns + 1000000000))
+        catalog.invalidate(folder)
+    for name, folder, allowed in (("tv", folders["tv"], LEGAL_VIDEO), ("games", folders["games"], LEGAL_GAMES)):
+        b.time(f"contraband.first_scan.{name}", lambda: scanner.scan(folder, allowed))
+        b.time(f"contraband.rescan.{name}", lambda: scanner.scan(folder, allowed), 15, setup=lambda: rewrite_a_few(folder))
+    files = [(os.path.join(f, e.name), e.size, e.mtime_ns, e.ino) for f in folder_list for e in catalog.entries(f, refresh=False).values()]
+    b.time("classify.find_duplicates", lambda: classifier.find_duplicates(files), 3)
+
+    view = QuarantineView(catalog, folders["trash"])
+    b.time("quarantine.first_query", lambda: view.query("", True))
+    for typed in ("m", "ma", "mar", "mari", "mario", "mario z", "mario ze"):
+        for newest in (True, False):
+            b.time("quarantine.query", lambda: view.query(typed, newest), 5)
+
+    sections = {"TV": (folders["tv"], LEGAL_VIDEO), "GAME": (folders["games"], LEGAL_GAMES)}
+    titles = b.time("titles.build", lambda: TitleIndex(catalog, sections), 3)
+    for q in ("TV 1942", "GAME 7", "mario", "TV zelda sp", "tertis", "ep123"):
+        b.time("titles.suggest", lambda: titles.suggest(q, 8), 20)
+
+    # The TV grid's sort/filter pass and captions, with every file probed (random but plausible metadata)
+    tv = list(catalog.entries(folders["tv"], refresh=False).values())
+    media = MediaIndex()
+    for e in tv:
+        height = rng.choice([None, 480, 720, 1080, 2160])
+        media.data[media.key(e)] = {"size": e.size, "duration": rng.uniform(30, 7200) if height else None,
+                                    "width": height and height * 16 // 9, "height": height,
+                                    "video_codec": height and rng.choice(["H.264", "H.265", "AV1"])}
+    for sort in TV_SORTS:
+        b.time(f"tv.rows.{sort.lower()}", lambda: tv_rows(tv, media, sort), 5)
+    b.time("tv.rows.filtered", lambda: tv_rows(tv, media, "DURATION", "FULL HD+"), 5)
+    # Captions are made per card as it scrolls into view: one screenful
+    rows = tv_rows(tv, media)
+    screen = grid_window(len(rows), 950, 600, 0, 230, 190)[2]
+    b.time("tv.captions_screen", lambda: [describe(rows[i][1] or {"size": rows[i][0].size}) for i in screen], 50)
+
+    count = len(tv)
+    for _ in range(2000):
+        top = rng.randrange(max(1, count // 4 * 190))
+        b.time("grid.window", lambda: grid_window(count, 950, 600, top, 230, 190))
+
+
+def bench_launcher(b, root, launches):
+    """Launch-to-ready of a trivial .py game: a fresh interpreter vs the pre-warmed fork server."""
+    game = os.path.join(root, "bench game.py")
+    with open(game, "w", encoding="utf-8") as f: f.write("x = 1\n")
+    for fork in (False, True):
+        if fork and not hasattr(os, "fork"): continue
+        exited = threading.Event()
+        launcher = GameLauncher(lambda event, s: exited.set() if event == "exit" else None, fork_server=fork)
+        try:
+            for i in range(launches + 1):
+                exited.clear()
+                s = launcher.launch(game, "bench")
+                if not exited.wait(30): raise RuntimeError("bench game did not exit")
+                # The first launch pays for starting the fork server; not what's being compared
+                if i and s.ready_s is not None: b.perf.record(f"launcher.ready.{s.mode}", s.ready_s * 1000)
+        finally:
+            launcher.close()
+
+
+# --- RESULTS ---
+def compare(results, baseline, threshold, floor_ms=0.1):
+    """Cases whose median got more than threshold slower than the baseline (ignoring sub-floor noise)."""
+    worse = []
+    for name, s in results.items():
+        old = baseline.get(name)
+        if not old: continue
+        if s["p50_ms"] > old["p50_ms"] * (1 + threshold) and s["p50_ms"] - old["p50_ms"] > floor_ms:
+            worse.append((name, old["p50_ms"], s["p50_ms"]))
+    return worse
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--files", type=int, default=10000, help="library size (files across TV/games/trash)")
+    ap.add_argument("--history", type=int, default=100000, help="legacy history entries in the settings fixture")
+    ap.add_argument("--full", action="store_true", help="100k files and 1M history entries")
+    ap.add_argument("--seed", type=int, default=1942)
+    ap.add_argument("--json", help="write results to this file")
+    ap.add_argument("--compare", help="baseline JSON from an earlier --json run")
+    ap.add_argument("--threshold", type=float, default=0.5, help="allowed slowdown of a median vs the baseline (0.5 = 50%%)")
+    ap.add_argument("--launches", type=int, default=10, help="game launches per launcher mode (0 skips them)")
+    ap.add_argument("--keep", action="store_true", help="keep the fixture folder")
+    args = ap.parse_args(argv)
+    if args.full: args.files, args.history = 100000, 1000000
+
+    root = tempfile.mkdtemp(prefix="worldx-bench-")
+    b = Bench()
+    try:
+        print(f"Fixtures in {root}: {args.files} files, {args.history} history entries (seed {args.seed})", file=sys.stderr)
+        settings_path = os.path.join(root, "legacy_settings.json")
+        folders = make_library(os.path.join(root, "library"), args.files, args.seed)
+        make_settings(settings_path, args.history, args.seed)
+        rng = random.Random(args.seed)
+        print("Timing history + settings...", file=sys.stderr)
+        bench_history(b, root, settings_path, rng)
+        print("Timing library, contraband, quarantine, titles, grid...", file=sys.stderr)
+        bench_library(b, root, folders, rng)
+        if args.launches:
+            print("Timing game launches...", file=sys.stderr)
+            bench_launcher(b, root, args.launches)
+    finally:
+        if args.keep: print(f"Kept {root}", file=sys.stderr)
+        else: shutil.rmtree(root, ignore_errors=True)
+
+    print(b.perf.format_summary())
+    report = {"params": {"files": args.files, "history": args.history, "seed": args.seed},
+              "python": platform.python_version(), "platform": platform.platform(), "results": b.perf.summary()}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f: json.dump(report, f, indent=1)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f: baseline = json.load(f)
+        if baseline.get("params") != report["params"]:
+            print(f"WARNING: baseline was run with {baseline.get('params')}, not {report['params']}", file=sys.stderr)
+        worse = compare(report["results"], baseline.get("results", {}), args.threshold)
+        for name, old, new in worse: print(f"REGRESSION {name}: {old:.3f} ms -> {new:.3f} ms ({new / old - 1:+.0%})")
+        if worse: return 1
+        print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
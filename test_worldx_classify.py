@@ -0,0 +1,48 @@
+import json
+
+from worldx_classify import FileClassifier, sniff
+
+MP4_HEAD = b"\x00\x00\x00\x18ftypisom\x00\x00\x02\x00isomiso2" + b"\x00\x00\x00\x08free"
+
+
+def test_comments_naming_box_types_are_not_mp4():
+    assert sniff(b"# A free game\nimport random") == "text"
+    assert sniff(b"# I skip levels\n") == "text"
+    assert sniff(b"# A wide screen\n") == "text"
+
+
+def test_real_mp4_headers():
+    assert sniff(MP4_HEAD) == "mp4"
+    # No ftyp, but a plausible first box followed by another one
+    assert sniff(b"\x00\x00\x00\x08wide" + b"\x00\x00\x10\x00mdat" + b"\x00" * 16) == "mp4"
+    assert sniff(b"\x00\x00\x00\x04ftyp") != "mp4"
+
+
+def test_pep263_coding_line_is_text():
+    source = "# -*- coding: cp1252 -*-\nprint('café – naïve')\n".encode("cp1252")
+    assert sniff(source) == "text"
+    assert sniff(b"#!/usr/bin/env python\n# vim: set fileencoding=latin-1 :\nx = '\xe9'\n") == "text"
+    assert sniff("print('café')\n".encode("cp1252")) == "binary"
+
+
+def test_old_cache_verdicts_are_redone(tmp_path):
+    game = tmp_path / "free.py"
+    game.write_bytes(b"# A free game\nimport random\n")
+    st = game.stat()
+    cache = tmp_path / "sig.json"
+    cache.write_text(json.dumps({str(st.st_ino): {"sig": [st.st_size, st.st_mtime_ns], "kind": "mp4"}}))
+    assert FileClassifier(str(cache)).matches_ext(str(game), ".py")
+
+
+def test_retain_drops_gone_and_changed_files(tmp_path):
+    classifier = FileClassifier(str(tmp_path / "signatures.json"))
+    files = []
+    for name in ("kept.mp4", "changed.mp4", "gone.mp4"):
+        path = tmp_path / name; path.write_bytes(MP4_HEAD)
+        st = path.stat(); files.append((str(path), st.st_size, st.st_mtime_ns, st.st_ino))
+        assert classifier.kind(*files[-1]) == "mp4"
+    kept, changed, gone = files
+    classifier.retain([kept, changed[:2] + (changed[2] + 1, changed[3])])
+    assert set(classifier.cache) == {str(kept[3])}
+    classifier.save()
+    assert set(json.loads((tmp_path / "signatures.json").read_text())["files"]) == {str(kept[3])}
@@ -0,0 +1,88 @@
+import errno
+import os
+import threading
+
+import pytest
+
+import worldx_fileops
+from worldx_fileops import Cancelled, FileOpEngine, copy_file, unique_destination
+
+
+def fail_with(code):
+    def fail(*args):
+        raise OSError(code, os.strerror(code))
+    return fail
+
+
+@pytest.fixture
+def src(tmp_path, monkeypatch):
+    monkeypatch.setattr(worldx_fileops, "COPY_CHUNK", 64 * 1024)
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(os.urandom(300 * 1024))
+    return path
+
+
+def test_cross_device_copy_falls_back_to_sendfile(src, tmp_path, monkeypatch):
+    if not worldx_fileops.sys.platform.startswith("linux"): pytest.skip("sendfile step is Linux-only")
+    calls = []
+    real_sendfile = os.sendfile
+    monkeypatch.setattr(os, "copy_file_range", fail_with(errno.EXDEV), raising=False)
+    monkeypatch.setattr(os, "sendfile", lambda *a: calls.append(a) or real_sendfile(*a))
+    copy_file(str(src), str(tmp_path / "out.mp4"))
+    assert calls
+    assert (tmp_path / "out.mp4").read_bytes() == src.read_bytes()
+
+
+def test_fallback_resumes_where_the_previous_step_stopped(src, tmp_path, monkeypatch):
+    real = os.copy_file_range if hasattr(os, "copy_file_range") else None
+    if real is None: pytest.skip("no copy_file_range")
+    calls = []
+    def once_then_exdev(*a):
+        calls.append(a)
+        if len(calls) > 1: raise OSError(errno.EXDEV, "cross-device")
+        return real(*a)
+    monkeypatch.setattr(os, "copy_file_range", once_then_exdev)
+    monkeypatch.setattr(os, "sendfile", fail_with(errno.EINVAL), raising=False)
+    copy_file(str(src), str(tmp_path / "out.mp4"))
+    assert (tmp_path / "out.mp4").read_bytes() == src.read_bytes()
+
+
+def test_real_io_errors_are_not_swallowed(src, tmp_path, monkeypatch):
+    monkeypatch.setattr(worldx_fileops, "kernel_copies", lambda: [fail_with(errno.EIO)])
+    monkeypatch.setattr(os, "rename", fail_with(errno.EXDEV))
+    with pytest.raises(OSError):
+        FileOpEngine.move(str(src), str(tmp_path / "out.mp4"))
+    assert src.exists() and not (tmp_path / "out.mp4").exists()
+
+
+def test_cancelled_move_removes_partial_copy(src, tmp_path, monkeypatch):
+    monkeypatch.setattr(os, "rename", fail_with(errno.EXDEV))
+    cancelled = threading.Event(); cancelled.set()
+    with pytest.raises(Cancelled):
+        FileOpEngine.move(str(src), str(tmp_path / "out.mp4"), cancelled)
+    assert src.exists() and not (tmp_path / "out.mp4").exists()
+
+
+def test_parallel_moves_reserve_distinct_names(tmp_path):
+    dst = tmp_path / "trash"; dst.mkdir()
+    (dst / "game.py").write_text("already here")
+    ops = []
+    for i in range(8):
+        folder = tmp_path / f"from{i}"; folder.mkdir()
+        (folder / "game.py").write_text(str(i))
+        ops.append(("move", str(folder / "game.py"), str(dst)))
+    finished = threading.Event()
+    engine = FileOpEngine(workers=4)
+    batch = engine.submit(ops, on_done=lambda b: finished.set())
+    assert finished.wait(10)
+    engine.shutdown()
+    assert not batch.errors and len(batch.moved) == 8
+    assert len({d for s, d in batch.moved}) == 8
+    assert sorted(p.read_text() for p in dst.iterdir() if p.name != "game.py") == [str(i) for i in range(8)]
+
+
+def test_unique_destination_keeps_existing_files(tmp_path):
+    (tmp_path / "a.mp4").write_bytes(b"x")
+    assert unique_destination(str(tmp_path), "b.mp4") == str(tmp_path / "b.mp4")
+    clash = unique_destination(str(tmp_path), "a.mp4")
+    assert clash != str(tmp_path / "a.mp4") and clash.endswith(".mp4")
@@ -0,0 +1,72 @@
+import pytest
+
+from worldx_history import HistoryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = HistoryStore(str(tmp_path / "history.db"))
+    yield s
+    s.close()
+
+
+def texts(rows):
+    return [row[4] for row in rows]
+
+
+def test_offsets_map_onto_ids_when_contiguous(store):
+    for i in range(50): store.append(f"Restored: clip {i}.mp4", ts=1000 + i)
+    assert store.compact(max_rows=40) == 10
+    assert store._span()[1]
+    assert texts(store.page(0, 3)) == ["Restored: clip 49.mp4", "Restored: clip 48.mp4", "Restored: clip 47.mp4"]
+    assert texts(store.page(38, 5)) == ["Restored: clip 11.mp4", "Restored: clip 10.mp4"]
+    newest = store.page(0, 1)[0][0]
+    assert store.offset_of(newest - 7) == 7
+    assert store.find("clip 12.") == 37
+    assert store.find("clip 49", start=1) is None
+
+
+def test_offsets_fall_back_to_scans_with_gaps(store):
+    for i in range(20): store.append(f"Launched Game: game {i}.py", ts=1000 + i)
+    with store.db: store.db.execute("DELETE FROM events WHERE text = 'Launched Game: game 15.py'")
+    store.span = None
+    assert not store._span()[1]
+    assert texts(store.page(3, 2)) == ["Launched Game: game 16.py", "Launched Game: game 14.py"]
+    assert store.find("game 14.") == 4
+    assert store.offset_at_time(1014.5) == 4
+
+
+def test_entries_logged_during_migration_come_after_the_import(store):
+    store.append("Accessed TV Station")
+    store.hold()
+    assert store.migrating
+    store.append("Restored: late.mp4")
+    legacy = ["[2024-01-01 10:00:00] Restored: old.mp4", "[2024-01-01 10:00:30] Deleted forever: older.exe", "garbage"]
+    assert store.migrate_legacy(legacy) == 3
+    assert store.count() == 4
+    store.release()
+    assert not store.migrating
+    assert texts(store.newest(10)) == ["Restored: late.mp4", "garbage", "Deleted forever: older.exe",
+                                       "Restored: old.mp4", "Accessed TV Station"]
+    assert store.newest(10)[2][2:4] == ("delete", "older.exe")
+
+
+def test_migration_runs_once(store, tmp_path):
+    assert store.migrate_legacy(["[2024-01-01 10:00:00] Restored: old.mp4"]) == 1
+    assert store.migrate_legacy(["[2024-01-01 10:00:00] Restored: old.mp4"]) == 0
+    reopened = HistoryStore(str(tmp_path / "history.db"))
+    try: assert reopened.migrate_legacy(["anything"]) == 0 and reopened.count() == 1
+    finally: reopened.close()
+
+
+def test_clear_keeps_search_working(store):
+    for i in range(100): store.append(f"Restored: clip {i}.mp4")
+    store.clear()
+    assert store.count() == 0 and store.search("clip") == []
+    triggers = {r[0] for r in store.db.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+    if store.fts: assert {"events_ai", "events_ad"} <= triggers
+    store.append("Restored: fresh clip.mp4")
+    store.append("Restored: other.mp4")
+    store.compact(max_rows=1)
+    assert texts(store.search("clip")) == []
+    assert texts(store.search("other")) == ["Restored: other.mp4"]
@@ -0,0 +1,68 @@
+import os
+
+from worldx_classify import FileClassifier
+from worldx_library import ContrabandScanner, LibraryCatalog, TitleIndex
+
+
+def make_index(tmp_path, tv, games):
+    for folder, names in (("tv", tv), ("games", games)):
+        (tmp_path / folder).mkdir()
+        for name in names: (tmp_path / folder / name).write_bytes(b"x")
+    catalog = LibraryCatalog([str(tmp_path / "tv"), str(tmp_path / "games")])
+    for folder in catalog.folders: catalog.refresh(folder)
+    return TitleIndex(catalog, {"TV": (str(tmp_path / "tv"), [".mp4"]),
+                                "GAME": (str(tmp_path / "games"), [".py", ".exe"])})
+
+
+def test_resolve_only_opens_unambiguous_titles(tmp_path):
+    idx = make_index(tmp_path, ["movie 1942.mp4", "news 7.mp4"], ["space invaders.exe", "snake.py", "snail.py"])
+    assert idx.resolve("TV 1942") == ("TV", "movie 1942.mp4")
+    assert idx.resolve("TV 1943") is None
+    assert idx.resolve("GAME space invaders") == ("GAME", "space invaders.exe")
+    assert idx.resolve("GAME spa") == ("GAME", "space invaders.exe")
+    assert idx.resolve("GAME sna") is None          # two titles start with it
+    assert idx.resolve("GAME ace") is None          # substring only
+    assert idx.resolve("GAME pace") is None
+    assert ("GAME", "space invaders.exe") in idx.suggest("GAME pace")
+
+
+def test_shared_title_numbers_only_suggest(tmp_path):
+    idx = make_index(tmp_path, ["movie 1942.mp4", "news 1942.mp4", "7.mp4", "news 7.mp4"], [])
+    assert idx.resolve("TV 1942") is None
+    assert idx.suggest("TV 1942")[:2] == [("TV", "movie 1942.mp4"), ("TV", "news 1942.mp4")]
+    assert idx.resolve("TV 7") == ("TV", "7.mp4")  # still an exact title
+
+
+def test_non_ascii_digits_do_not_crash(tmp_path):
+    idx = make_index(tmp_path, ["movie 1942.mp4"], [])
+    assert idx.resolve("TV ²") is None
+    assert idx.suggest("TV ²") == []
+
+
+def test_ignored_contraband_is_reported_again(tmp_path):
+    tv = tmp_path / "tv"; tv.mkdir()
+    (tv / "fake.mp4").write_bytes(b"MZ" + b"\0" * 64)
+    (tv / "virus.exe").write_bytes(b"MZ")
+    (tv / "ok.mp4").write_bytes(b"\x00\x00\x00\x18ftypisom" + b"\0" * 16)
+    catalog = LibraryCatalog([str(tv)])
+    scanner = ContrabandScanner(catalog, FileClassifier())
+    first = [e.name for e in scanner.scan(str(tv), [".mp4"])[1]]
+    assert first == ["fake.mp4", "virus.exe"]
+    assert [e.name for e in scanner.scan(str(tv), [".mp4"])[1]] == first
+    (tv / "virus.exe").unlink(); catalog.invalidate(str(tv))
+    assert [e.name for e in scanner.scan(str(tv), [".mp4"])[1]] == ["fake.mp4"]
+    assert scanner.flagged_names(str(tv)) == {"fake.mp4"}
+
+
+def test_poll_notices_files_still_being_written(tmp_path):
+    tv = tmp_path / "tv"; tv.mkdir()
+    (tv / "old.mp4").write_bytes(b"x")
+    os.utime(tv / "old.mp4", (1, 1))
+    (tv / "download.mp4").write_bytes(b"x")
+    catalog = LibraryCatalog([str(tv)])
+    catalog.refresh(str(tv))
+    with open(tv / "download.mp4", "ab") as f: f.write(b"more")  # the folder mtime doesn't move
+    assert catalog.poll() == []
+    [diff] = catalog.poll(recent_ns=600 * 10**9)
+    assert diff.changed == ["download.mp4"] and catalog.entries(str(tv), refresh=False)["download.mp4"].size == 5
+    assert not catalog.recent_changed(str(tv), 600 * 10**9)
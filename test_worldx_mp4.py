@@ -0,0 +1,75 @@
+import struct
+
+from worldx_mp4 import describe, probe
+
+
+def box(typ, *children):
+    body = b"".join(children)
+    return struct.pack(">I4s", 8 + len(body), typ) + body
+
+
+def box64(typ, *children):
+    body = b"".join(children)
+    return struct.pack(">I4sQ", 1, typ, 16 + len(body)) + body
+
+
+def mvhd(scale, duration, version=0):
+    if version: return box(b"mvhd", struct.pack(">B3xQQIQ", 1, 0, 0, scale, duration), bytes(80))
+    return box(b"mvhd", struct.pack(">B3xIIII", 0, 0, 0, scale, duration), bytes(80))
+
+
+def tkhd(width, height, version=0):
+    head = bytes(88 if version else 76)
+    return box(b"tkhd", bytes([version]) + head[1:], struct.pack(">II", width << 16, height << 16))
+
+
+def trak(handler, fourcc, *extra):
+    hdlr = box(b"hdlr", bytes(8), handler, bytes(12))
+    stsd = box(b"stsd", struct.pack(">II", 0, 1), box(fourcc, bytes(8)))
+    return box(b"trak", *extra, box(b"mdia", hdlr, box(b"minf", box(b"stbl", stsd))))
+
+
+FTYP = box(b"ftyp", b"isom", bytes(4), b"isomiso2")
+
+
+def write(tmp_path, *parts):
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(b"".join(parts))
+    return str(path)
+
+
+def test_moov_before_mdat(tmp_path):
+    moov = box(b"moov", mvhd(1000, 187500), trak(b"vide", b"avc1", tkhd(1920, 1080)), trak(b"soun", b"mp4a"))
+    info = probe(write(tmp_path, FTYP, moov, box(b"mdat", bytes(4096))))
+    assert info["duration"] == 187.5
+    assert (info["width"], info["height"], info["video_codec"], info["audio_codec"]) == (1920, 1080, "H.264", "AAC")
+
+
+def test_moov_after_a_64_bit_mdat(tmp_path):
+    moov = box(b"moov", mvhd(600, 600 * 3600), trak(b"soun", b"Opus"), trak(b"vide", b"hvc1", tkhd(3840, 2160)))
+    path = write(tmp_path, FTYP, box64(b"mdat", bytes(1024)), box(b"free"), moov)
+    info = probe(path)
+    assert info["duration"] == 3600 and info["height"] == 2160
+    assert (info["video_codec"], info["audio_codec"]) == ("H.265", "Opus")
+    assert describe(info).startswith("1:00:00 | 3840x2160 | H.265 | ")
+
+
+def test_version_1_headers(tmp_path):
+    moov = box(b"moov", mvhd(90000, 90000 * 65, version=1), trak(b"vide", b"av01", tkhd(1280, 720, version=1)))
+    info = probe(write(tmp_path, FTYP, moov))
+    assert (info["duration"], info["width"], info["height"], info["video_codec"]) == (65, 1280, 720, "AV1")
+    assert describe(info) == f"1:05 | 1280x720 | AV1 | {info['size'] / 1048576:.1f} MB"
+
+
+def test_truncated_moov_keeps_what_was_read(tmp_path):
+    moov = box(b"moov", mvhd(1000, 5000), trak(b"vide", b"avc1", tkhd(640, 480)))
+    data = FTYP + moov
+    info = probe(write(tmp_path, data[:len(FTYP) + 8 + 108 + 40]))  # cut inside the trak
+    assert info["duration"] == 5
+    assert info["video_codec"] is None and info["width"] is None
+
+
+def test_not_an_mp4(tmp_path):
+    assert probe(write(tmp_path, b"MZ" + bytes(200))) is None
+    assert probe(write(tmp_path, FTYP, box(b"mdat", bytes(64)))) is None
+    assert describe({"size": 3 * 1048576}) == "3.0 MB"
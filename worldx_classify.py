@@ -0,0 +1,188 @@
+import codecs
+import hashlib
+import json
+import os
+import re
+import threading
+
+from worldx_settings import write_atomic, dump_compact
+
+# --- CONTENT CLASSIFIER ---
+# Extensions lie; the first few hundred bytes don't. Each file is sniffed once and the verdict is
+# cached by (inode, size, mtime), so unchanged files are never opened again.
+
+SNIFF_BYTES = 512
+SNIFF_VERSION = 2  # bump when sniff() changes so cached verdicts are redone
+PARTIAL_BYTES = 64 * 1024
+CHUNK_BYTES = 1024 * 1024
+
+# Approved extensions per station (WorldX and the benchmark both read these)
+LEGAL_VIDEO = [".mp4"]
+LEGAL_GAMES = [".py", ".exe", ".url", ".lnk"]
+
+# What the content of each approved extension has to look like
+KIND_BY_EXT = {".mp4": ("mp4",), ".exe": ("pe",), ".url": ("url",), ".lnk": ("lnk",), ".py": ("text", "empty")}
+
+MP4_BOXES = {b"ftyp", b"moov", b"mdat", b"free", b"skip", b"wide"}
+CODING_LINE = re.compile(rb"^[ \t\f]*#.*?coding[:=][ \t]*([-\w.]+)")
+LNK_HEADER = b"\x4c\x00\x00\x00\x01\x14\x02\x00\x00\x00\x00\x00\xc0\x00\x00\x00\x00\x00\x00\x46"
+
+
+def box_at(head, offset):
+    """(size, type) of the ISO-BMFF box header at offset, or None if it can't be one."""
+    if len(head) < offset + 8: return None
+    size, kind = int.from_bytes(head[offset:offset + 4], "big"), head[offset + 4:offset + 8]
+    if size not in (0, 1) and size < 8: return None
+    return size, kind
+
+
+def is_mp4(head):
+    # Box names like "free" / "skip" are plain English, so a bare name at bytes 4-8 proves nothing
+    # ("# A free game"). Real files open with ftyp; anything else must be followed by a second box.
+    first = box_at(head, 0)
+    if first is None or first[1] not in MP4_BOXES: return False
+    if first[1] == b"ftyp": return True
+    size = first[0]
+    if size < 8: return False
+    second = box_at(head, size)
+    return second is not None and second[1] in MP4_BOXES
+
+
+def declared_encoding(head):
+    """Codec named by a PEP 263 coding line in the first two lines, if Python knows it."""
+    for line in head.split(b"\n", 2)[:2]:
+        m = CODING_LINE.match(line)
+        if m:
+            try: return codecs.lookup(m.group(1).decode("ascii")).name
+            except LookupError: return None
+    return None
+
+
+def sniff(head):
+    """Kind of file from its leading bytes: mp4, pe, lnk, url, text, binary or empty."""
+    if not head: return "empty"
+    if is_mp4(head): return "mp4"
+    if head[:2] == b"MZ": return "pe"
+    if head[:20] == LNK_HEADER: return "lnk"
+    if b"\0" in head: return "binary"
+    for encoding in ("utf-8-sig", declared_encoding(head)):
+        if encoding is None: continue
+        try:
+            # Incremental decode so a multi-byte character cut off at the end doesn't count as binary
+            text = codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+        except UnicodeDecodeError:
+            continue
+        if text.lstrip().lower().startswith("[internetshortcut]"): return "url"
+        return "text"
+    return "binary"
+
+
+def read_head(path, size=SNIFF_BYTES):
+    with open(path, "rb") as f: return f.read(size)
+
+
+class FileClassifier:
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.cache = {}  # identity -> {"sig": (size, mtime_ns), "kind": .., "partial": .., "full": ..}
+        self.reads = 0
+        if cache_path: self.load()
+
+    # --- PERSISTENCE ---
+    def load(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f: data = json.load(f)
+        except (OSError, ValueError): return
+        if not isinstance(data, dict): return
+        files = data.get("files") if data.get("version") == SNIFF_VERSION else data
+        if not isinstance(files, dict): return
+        self.cache = {k: dict(v, sig=tuple(v["sig"])) for k, v in files.items() if isinstance(v, dict) and "sig" in v}
+        if files is data:
+            # Saved by an older sniff(): hashes still hold, the verdicts get redone
+            for rec in self.cache.values(): rec.pop("kind", None)
+            self.dirty = True
+
+    def save(self):
+        if not self.cache_path or not self.dirty: return
+        with self.lock:
+            data = dump_compact({"version": SNIFF_VERSION, "files": self.cache})
+            self.dirty = False
+        write_atomic(self.cache_path, data)
+
+    def retain(self, files):
+        """files: [(path, size, mtime_ns, ino), ...] still around. Drops records for everything else."""
+        keep = {(str(ino) if ino else os.path.abspath(path), (size, mtime_ns)) for path, size, mtime_ns, ino in files}
+        with self.lock:
+            stale = [k for k, rec in self.cache.items() if (k, rec["sig"]) not in keep]
+            for k in stale: del self.cache[k]
+            if stale: self.dirty = True
+
+    def _record(self, path, size, mtime_ns, ino):
+        # Inode keeps the cache valid when a file moves between folders (e.g. into quarantine)
+        key = str(ino) if ino else os.path.abspath(path)
+        with self.lock:
+            rec = self.cache.get(key)
+            if rec is None or rec["sig"] != (size, mtime_ns):
+                rec = self.cache[key] = {"sig": (size, mtime_ns)}
+                self.dirty = True
+            return rec
+
+    def _stat(self, path):
+        st = os.stat(path)
+        return st.st_size, st.st_mtime_ns, st.st_ino
+
+    # --- CLASSIFY ---
+    def kind(self, path, size=None, mtime_ns=None, ino=None):
+        if size is None: size, mtime_ns, ino = self._stat(path)
+        rec = self._record(path, size, mtime_ns, ino)
+        if "kind" not in rec:
+            try: head = read_head(path)
+            except OSError: return "unreadable"
+            self.reads += 1
+            with self.lock: rec["kind"] = sniff(head); self.dirty = True
+        return rec["kind"]
+
+    def matches_ext(self, path, ext, size=None, mtime_ns=None, ino=None):
+        """True if the file's content is what its extension claims."""
+        expected = KIND_BY_EXT.get(ext)
+        return expected is None or self.kind(path, size, mtime_ns, ino) in expected
+
+    # --- HASHES ---
+    def partial_hash(self, path, size, mtime_ns, ino):
+        rec = self._record(path, size, mtime_ns, ino)
+        if "partial" not in rec:
+            h = hashlib.blake2b(digest_size=16)
+            with open(path, "rb") as f:
+                if size <= 2 * PARTIAL_BYTES:
+                    h.update(f.read())  # small files: this already is the full content
+                else:
+                    h.update(f.read(PARTIAL_BYTES))
+                    f.seek(-PARTIAL_BYTES, os.SEEK_END); h.update(f.read(PARTIAL_BYTES))
+            with self.lock: rec["partial"] = h.hexdigest(); self.dirty = True
+        return rec["partial"]
+
+    def full_hash(self, path, size, mtime_ns, ino):
+        rec = self._record(path, size, mtime_ns, ino)
+        if "full" not in rec:
+            h = hashlib.blake2b(digest_size=32)
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_BYTES), b""): h.update(chunk)
+            with self.lock: rec["full"] = h.hexdigest(); self.dirty = True
+        return rec["full"]
+
+    def find_duplicates(self, files):
+        """files: [(path, size, mtime_ns, ino), ...]. Returns groups (lists of paths, in input order) of
+        identical files. Narrows by size, then a head+tail hash, and only then hashes whole files."""
+        def bucket(items, key):
+            groups = {}
+            for item in items:
+                try: groups.setdefault(key(item), []).append(item)
+                except OSError: pass
+            return [g for g in groups.values() if len(g) > 1]
+        same_size = bucket([f for f in files if f[1] > 0], lambda f: f[1])
+        same_partial = [g for group in same_size for g in bucket(group, lambda f: self.partial_hash(*f))]
+        same_full = [g for group in same_partial for g in
+                     (bucket(group, lambda f: self.full_hash(*f)) if group[0][1] > 2 * PARTIAL_BYTES else [group])]
+        return [[f[0] for f in g] for g in same_full]
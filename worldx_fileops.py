@@ -0,0 +1,179 @@
+import errno
+import os
+import shutil
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# --- FILE OPERATIONS ---
+# Bulk moves/deletes (restore all, empty trash, quarantine) run on a small thread pool with progress
+# and cancellation. A move is a rename when source and destination share a device; otherwise the
+# bytes are copied in the kernel (copy_file_range, then sendfile) and the source removed.
+
+COPY_CHUNK = 8 * 1024 * 1024
+# errnos meaning "this copy method doesn't work here", as opposed to a real I/O failure
+FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.ENOTSOCK}
+
+
+class Cancelled(Exception):
+    pass
+
+
+def unique_destination(folder, name):
+    """Path for name inside folder; on a clash the name gets a _HHMMSS timestamp like quarantine always did."""
+    dst = os.path.join(folder, name)
+    if os.path.exists(dst):
+        base, extension = os.path.splitext(name)
+        timestamp = datetime.now().strftime("%H%M%S")
+        dst = os.path.join(folder, f"{base}_{timestamp}{extension}")
+        n = 1
+        while os.path.exists(dst):
+            dst = os.path.join(folder, f"{base}_{timestamp}_{n}{extension}"); n += 1
+    return dst
+
+
+def is_cross_device(e):
+    return e.errno == errno.EXDEV or getattr(e, "winerror", None) == 17  # ERROR_NOT_SAME_DEVICE
+
+
+def kernel_copies():
+    """In-kernel copy steps, best first. Each is step(fin, fout, offset, count) -> bytes copied."""
+    steps = []
+    if hasattr(os, "copy_file_range"):
+        # Same filesystem, or any two filesystems on kernels before 5.19 (EXDEV after that)
+        steps.append(lambda fin, fout, done, n: os.copy_file_range(fin, fout, n, done, done))
+    if hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+        # Only Linux sendfile() takes a regular file as the destination (macOS: ENOTSOCK)
+        def sendfile(fin, fout, done, n):
+            os.lseek(fout, done, os.SEEK_SET)
+            return os.sendfile(fout, fin, done, n)
+        steps.append(sendfile)
+    return steps
+
+
+def copy_file(src, dst, cancelled=None):
+    """Copies src to a new file dst, in-kernel where the OS allows it. Checks cancelled between chunks."""
+    def check():
+        if cancelled is not None and cancelled.is_set(): raise Cancelled()
+    with open(src, "rb") as fi, open(dst, "xb") as fo:
+        fin, fout = fi.fileno(), fo.fileno()
+        size = os.fstat(fin).st_size
+        done = 0
+        # Each step carries on from where the one before gave up; plain reads finish whatever is left
+        for step in kernel_copies():
+            try:
+                while done < size:
+                    check()
+                    n = step(fin, fout, done, min(COPY_CHUNK, size - done))
+                    if n == 0: break
+                    done += n
+                break
+            except OSError as e:
+                if e.errno not in FALLBACK_ERRNOS: raise
+        fi.seek(done); fo.seek(done)
+        while True:
+            check()
+            buf = fi.read(COPY_CHUNK)
+            if not buf: break
+            fo.write(buf)
+    shutil.copystat(src, dst)
+
+
+class Batch:
+    def __init__(self, total):
+        self.total = total
+        self.completed = 0
+        self.moved = []     # [(src, dst)]
+        self.deleted = []   # [path]
+        self.errors = []    # [(path, exception)]
+        self.cancel_event = threading.Event()
+        self.lock = threading.Lock()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+
+class FileOpEngine:
+    def __init__(self, workers=4):
+        self.workers = workers
+        self.pool = None
+        self.reserve_lock = threading.Lock()
+        self.reserved = set()
+        self.live = set()  # batches still running, cancelled on shutdown
+
+    def submit(self, ops, on_progress=None, on_done=None):
+        """ops: [("move", src, dst_folder), ("delete", path)]. dst_folder may be a callable(src) -> folder,
+        evaluated on the worker. on_progress(done, total) / on_done(batch) run on worker threads."""
+        batch = Batch(len(ops))
+        if not ops:
+            if on_done: on_done(batch)
+            return batch
+        if self.pool is None: self.pool = ThreadPoolExecutor(self.workers, thread_name_prefix="fileops")
+        with self.reserve_lock: self.live.add(batch)
+        for op in ops: self.pool.submit(self._run, batch, op, on_progress, on_done)
+        return batch
+
+    def _reserve(self, folder, name):
+        # Parallel moves into one folder must not pick the same "unique" name
+        with self.reserve_lock:
+            dst = unique_destination(folder, name)
+            base, extension = os.path.splitext(name)
+            n = 1
+            while dst in self.reserved or os.path.exists(dst):
+                dst = os.path.join(folder, f"{base}_{datetime.now().strftime('%H%M%S')}_{n}{extension}"); n += 1
+            self.reserved.add(dst)
+            return dst
+
+    def _run(self, batch, op, on_progress, on_done):
+        try:
+            if batch.cancelled: raise Cancelled()
+            if op[0] == "move":
+                src, folder = op[1], op[2]
+                if callable(folder): folder = folder(src)
+                dst = self._reserve(folder, os.path.basename(src))
+                try: self.move(src, dst, batch.cancel_event)
+                finally:
+                    with self.reserve_lock: self.reserved.discard(dst)
+                with batch.lock: batch.moved.append((src, dst))
+            elif op[0] == "delete":
+                os.remove(op[1])
+                with batch.lock: batch.deleted.append(op[1])
+        except Cancelled:
+            pass
+        except Exception as e:
+            with batch.lock: batch.errors.append((op[1], e))
+        with batch.lock:
+            batch.completed += 1
+            done, finished = batch.completed, batch.completed == batch.total
+        if finished:
+            with self.reserve_lock: self.live.discard(batch)
+        if on_progress: on_progress(done, batch.total)
+        if finished and on_done: on_done(batch)
+
+    @staticmethod
+    def move(src, dst, cancelled=None):
+        try:
+            os.rename(src, dst)  # same device: metadata only
+            return
+        except OSError as e:
+            if not is_cross_device(e): raise
+        try:
+            copy_file(src, dst, cancelled)
+        except FileExistsError:
+            raise
+        except BaseException:
+            try: os.remove(dst)
+            except OSError: pass
+            raise
+        os.remove(src)
+
+    def shutdown(self):
+        # Pool threads are joined at interpreter exit, so a running copy must be told to stop
+        with self.reserve_lock: live, self.live = list(self.live), set()
+        for batch in live: batch.cancel()
+        if self.pool: self.pool.shutdown(wait=False, cancel_futures=True)
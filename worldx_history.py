@@ -0,0 +1,259 @@
+import re
+import sqlite3
+import time
+from datetime import datetime
+
+# --- HISTORY STORE ---
+# Append-only event log kept in SQLite so adding an entry never rewrites settings.json.
+# Rows: id (insertion order), ts (epoch seconds), kind (action type), subject (file/name), text.
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+MIGRATE_CHUNK = 50000
+FTS_INSERT_TRIGGER = """CREATE TRIGGER IF NOT EXISTS events_ai AFTER INSERT ON events BEGIN
+                        INSERT INTO events_fts(rowid, text) VALUES (new.id, new.text); END"""
+FTS_DELETE_TRIGGER = """CREATE TRIGGER IF NOT EXISTS events_ad AFTER DELETE ON events BEGIN
+                        INSERT INTO events_fts(events_fts, rowid, text) VALUES ('delete', old.id, old.text); END"""
+LEGACY_ENTRY = re.compile(r"^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] (.*)$", re.S)
+
+# Prefix -> (kind, has_subject). Used for both new entries and migrated settings.json history.
+ACTION_KINDS = [
+    ("ACHIEVEMENT UNLOCKED: ", "achievement", True),
+    ("Quarantined illegal file: ", "quarantine", True),
+    ("Deleted forever: ", "delete", True),
+    ("Restored: ", "restore", True),
+    ("Launched Game: ", "launch", True),
+    ("Emptied Quarantine", "delete", False),
+    ("Restored all", "restore", False),
+    ("Accessed ", "nav", False),
+    ("Opened ", "nav", False),
+    ("Checked ", "nav", False),
+    ("Started Tutorial", "tutorial", False),
+    ("Finished Tutorial", "tutorial", False),
+]
+
+
+def classify_action(text):
+    """Returns (kind, subject) for a history line like 'Restored: clip.mp4'."""
+    for prefix, kind, has_subject in ACTION_KINDS:
+        if text.startswith(prefix):
+            return kind, (text[len(prefix):] if has_subject else None)
+    return "other", None
+
+
+def format_entry(row):
+    """Renders a row the way the old settings.json history looked: '[time] text'."""
+    return f"[{datetime.fromtimestamp(row[1]).strftime(TIME_FORMAT)}] {row[4]}"
+
+
+class HistoryStore:
+    COLUMNS = "id, ts, kind, subject, text"
+
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        with self.db:
+            self.db.executescript("""
+                CREATE TABLE IF NOT EXISTS events (
+                    id INTEGER PRIMARY KEY, ts REAL NOT NULL, kind TEXT NOT NULL,
+                    subject TEXT, text TEXT NOT NULL);
+                CREATE INDEX IF NOT EXISTS events_ts ON events(ts);
+                CREATE INDEX IF NOT EXISTS events_kind ON events(kind, id);
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            """)
+        self.fts = self._setup_fts()
+        self.span = None  # cached (MIN(id), MAX(id), COUNT(*)); COUNT(*) is a full scan in SQLite
+        self.held = None  # appends queued by hold()
+
+    def _setup_fts(self):
+        # Trigram FTS gives indexed substring search; fall back to LIKE scans on old SQLite builds.
+        try:
+            with self.db:
+                self.db.executescript("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+                        text, content='events', content_rowid='id', tokenize='trigram');
+                    """ + FTS_INSERT_TRIGGER + ";" + FTS_DELETE_TRIGGER + ";")
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    def close(self):
+        self.db.close()
+
+    # --- WRITES ---
+    def append(self, text, kind=None, subject=None, ts=None):
+        if kind is None:
+            kind, guessed = classify_action(text)
+            if subject is None: subject = guessed
+        if self.held is not None:
+            self.held.append((time.time() if ts is None else ts, kind, subject, text))
+            return
+        with self.db:
+            new_id = self.db.execute("INSERT INTO events (ts, kind, subject, text) VALUES (?, ?, ?, ?)",
+                                     (time.time() if ts is None else ts, kind, subject, text)).lastrowid
+        if self.span is not None:
+            lo, hi, n = self.span
+            self.span = (lo if n else new_id, new_id, n + 1)
+
+    def migrate_legacy(self, entries, on_progress=None):
+        """One-time import of the old settings.json 'history' list. Returns rows imported.
+        Uses its own connection so it can run on a worker thread; call hold() first so entries
+        logged meanwhile are written after the imported ones. on_progress(done, total) runs on
+        the calling thread."""
+        db = sqlite3.connect(self.path, isolation_level=None)
+        try:
+            if db.execute("SELECT 1 FROM meta WHERE key='legacy_migrated'").fetchone():
+                return 0
+            rows = []
+            for entry in entries:
+                m = LEGACY_ENTRY.match(str(entry))
+                if m:
+                    try: ts = datetime.strptime(m.group(1), TIME_FORMAT).timestamp()
+                    except ValueError: ts, text = 0.0, str(entry)
+                    else: text = m.group(2)
+                else:
+                    ts, text = 0.0, str(entry)
+                kind, subject = classify_action(text)
+                rows.append((ts, kind, subject, text))
+            # One transaction: bulk insert with the FTS trigger off, then index everything in one
+            # 'rebuild' (per-row trigger inserts are ~5x slower on a big import)
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                if self.fts: db.execute("DROP TRIGGER IF EXISTS events_ai")
+                for i in range(0, len(rows), MIGRATE_CHUNK):
+                    db.executemany("INSERT INTO events (ts, kind, subject, text) VALUES (?, ?, ?, ?)", rows[i:i + MIGRATE_CHUNK])
+                    if on_progress: on_progress(min(len(rows), i + MIGRATE_CHUNK), len(rows))
+                if self.fts:
+                    db.execute("INSERT INTO events_fts(events_fts) VALUES ('rebuild')")
+                    db.execute(FTS_INSERT_TRIGGER)
+                db.execute("INSERT INTO meta (key, value) VALUES ('legacy_migrated', ?)", (str(len(rows)),))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        finally:
+            db.close()
+        self.span = None
+        return len(rows)
+
+    def hold(self):
+        """Queues append()s in memory (e.g. while migrate_legacy runs) until release()."""
+        if self.held is None: self.held = []
+
+    def release(self):
+        held, self.held = self.held, None
+        if held:
+            with self.db:
+                self.db.executemany("INSERT INTO events (ts, kind, subject, text) VALUES (?, ?, ?, ?)", held)
+        self.span = None
+
+    @property
+    def migrating(self):
+        return self.held is not None
+
+    def clear(self):
+        # The delete trigger fires once per row; with it dropped the DELETE is a plain truncate and
+        # 'delete-all' empties the index in one go. Explicit BEGIN so the DDL is inside the transaction.
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            if self.fts: self.db.execute("DROP TRIGGER IF EXISTS events_ad")
+            self.db.execute("DELETE FROM events")
+            if self.fts:
+                self.db.execute("INSERT INTO events_fts(events_fts) VALUES ('delete-all')")
+                self.db.execute(FTS_DELETE_TRIGGER)
+        self.span = None
+        self.db.execute("PRAGMA incremental_vacuum")
+
+    def compact(self, max_rows=None, max_age_days=None):
+        """Retention policy: drop entries past max_rows or older than max_age_days. Returns rows removed."""
+        removed = 0
+        with self.db:
+            if max_age_days is not None:
+                cutoff = time.time() - max_age_days * 86400
+                removed += self.db.execute("DELETE FROM events WHERE ts < ?", (cutoff,)).rowcount
+            if max_rows is not None:
+                top = self.db.execute("SELECT MAX(id) FROM events").fetchone()[0]
+                if top is not None:
+                    removed += self.db.execute("DELETE FROM events WHERE id <= ?", (top - max_rows,)).rowcount
+        if removed:
+            self.span = None
+            if self.fts:
+                with self.db: self.db.execute("INSERT INTO events_fts(events_fts) VALUES ('optimize')")
+            self.db.execute("PRAGMA incremental_vacuum")
+        return removed
+
+    # --- QUERIES (all newest first) ---
+    def count(self):
+        return self._stats()[2]
+
+    def newest(self, limit):
+        return self.page(0, limit)
+
+    def _stats(self):
+        if self.span is None:
+            self.span = self.db.execute("SELECT MIN(id), MAX(id), COUNT(*) FROM events").fetchone()
+        return self.span
+
+    def _span(self):
+        # Retention only trims the oldest ids, so ids are usually contiguous and an
+        # offset maps straight onto an id (and back) instead of an O(offset) scan.
+        lo, hi, n = self._stats()
+        return hi, bool(n) and hi - lo + 1 == n
+
+    def page(self, offset, limit):
+        hi, contiguous = self._span()
+        if hi is None: return []
+        if contiguous:
+            return self.db.execute(f"SELECT {self.COLUMNS} FROM events WHERE id <= ? ORDER BY id DESC LIMIT ?",
+                                   (hi - offset, limit)).fetchall()
+        return self.db.execute(f"SELECT {self.COLUMNS} FROM events ORDER BY id DESC LIMIT ? OFFSET ?",
+                               (limit, offset)).fetchall()
+
+    def offset_of(self, event_id):
+        """Position (newest first) of an entry id."""
+        hi, contiguous = self._span()
+        if contiguous: return hi - event_id
+        return self.db.execute("SELECT COUNT(*) FROM events WHERE id > ?", (event_id,)).fetchone()[0]
+
+    def offset_at_time(self, ts):
+        """Position of the newest entry at or before ts (for jump-to-time)."""
+        row = self.db.execute("SELECT id FROM events WHERE ts <= ? ORDER BY ts DESC LIMIT 1", (ts,)).fetchone()
+        return self.count() if row is None else self.offset_of(row[0])
+
+    def find(self, query, start=0):
+        """Position of the first entry at or after start (newest first) containing query, or None."""
+        first = self.page(start, 1)
+        if not first: return None
+        if self.fts and len(query) >= 3:
+            row = self.db.execute("SELECT rowid FROM events_fts WHERE events_fts MATCH ? AND rowid <= ? ORDER BY rowid DESC LIMIT 1",
+                                  ('"' + query.replace('"', '""') + '"', first[0][0])).fetchone()
+        else:
+            pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            row = self.db.execute("SELECT id FROM events WHERE id <= ? AND text LIKE ? ESCAPE '\\' ORDER BY id DESC LIMIT 1",
+                                  (first[0][0], pattern)).fetchone()
+        return None if row is None else self.offset_of(row[0])
+
+    def between(self, start_ts, end_ts, limit=1000):
+        return self.db.execute(f"SELECT {self.COLUMNS} FROM events WHERE ts >= ? AND ts < ? ORDER BY ts DESC LIMIT ?",
+                               (start_ts, end_ts, limit)).fetchall()
+
+    def by_kind(self, kind, limit=1000, before_id=None):
+        if before_id is None:
+            return self.db.execute(f"SELECT {self.COLUMNS} FROM events WHERE kind = ? ORDER BY id DESC LIMIT ?",
+                                   (kind, limit)).fetchall()
+        return self.db.execute(f"SELECT {self.COLUMNS} FROM events WHERE kind = ? AND id < ? ORDER BY id DESC LIMIT ?",
+                               (kind, before_id, limit)).fetchall()
+
+    def search(self, query, limit=1000):
+        """Case-insensitive substring search over the entry text."""
+        if self.fts and len(query) >= 3:
+            phrase = '"' + query.replace('"', '""') + '"'
+            return self.db.execute(
+                f"SELECT {self.COLUMNS} FROM events WHERE id IN "
+                "(SELECT rowid FROM events_fts WHERE events_fts MATCH ?) ORDER BY id DESC LIMIT ?",
+                (phrase, limit)).fetchall()
+        pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        return self.db.execute(f"SELECT {self.COLUMNS} FROM events WHERE text LIKE ? ESCAPE '\\' ORDER BY id DESC LIMIT ?",
+                               (pattern, limit)).fetchall()
@@ -0,0 +1,237 @@
+import json
+import os
+import runpy
+import subprocess
+import sys
+import threading
+import time
+
+# --- GAME LAUNCHER ---
+# Tracks every game it starts: when the game became ready, how long the session lasted and how it
+# exited. .py games normally get a fresh interpreter; with the opt-in fork server they are forked
+# from an interpreter that already has the usual modules imported, which skips most of the startup.
+#
+# "Ready" means the game's own code is about to run: the child writes one byte to a pipe (spawn
+# mode) or reports to the fork server right before handing over to the game.
+
+PREWARM_MODULES = ["json", "math", "random", "time", "datetime", "collections", "tkinter", "tkinter.messagebox", "turtle"]
+OPTIONAL_PREWARM = ["pygame"]
+
+
+class LauncherBusy(Exception):
+    pass
+
+
+class Session:
+    def __init__(self, name, path, mode):
+        self.name, self.path, self.mode = name, path, mode
+        self.pid = None
+        self.started = time.perf_counter()
+        self.ready_s = None
+        self.duration_s = None
+        self.exit_code = None
+
+
+class GameLauncher:
+    def __init__(self, on_event=None, max_running=None, fork_server=False):
+        # on_event(event, session) runs on a launcher thread for "ready" and "exit"
+        self.on_event = on_event or (lambda event, session: None)
+        self.max_running = max_running
+        self.lock = threading.Lock()
+        self.running = {}  # key -> Session
+        self.latency = {"spawn": [], "fork": []}
+        self.use_fork = fork_server and hasattr(os, "fork")
+        self.server, self.next_id = None, 0
+
+    # --- PUBLIC ---
+    def launch(self, path, name):
+        """Starts a game. Returns the tracked Session, or None for files handed to the OS (.exe/.url/.lnk)."""
+        if not path.lower().endswith(".py"):
+            os.startfile(path)
+            return None
+        with self.lock:
+            if self.max_running and len(self.running) >= self.max_running:
+                raise LauncherBusy(f"{len(self.running)} games already running (limit {self.max_running})")
+        if self.use_fork and self._ensure_server():
+            return self._launch_forked(path, name)
+        return self._launch_spawned(path, name)
+
+    def warm_up(self):
+        """Starts the fork server ahead of the first launch (no-op unless fork mode is on)."""
+        if self.use_fork: self._ensure_server()
+
+    def stats(self):
+        """Mean / best launch-to-ready time per mode, in milliseconds."""
+        with self.lock:
+            return {mode: {"launches": len(v), "mean_ms": 1000 * sum(v) / len(v), "best_ms": 1000 * min(v)}
+                    for mode, v in self.latency.items() if v}
+
+    def running_count(self):
+        with self.lock: return len(self.running)
+
+    def close(self):
+        # Games keep running; only the fork server goes away
+        if self.server and self.server.poll() is None:
+            try: self.server.stdin.close()
+            except OSError: pass
+        self.server = None
+
+    # --- EVENTS ---
+    def _ready(self, key):
+        with self.lock:
+            s = self.running.get(key)
+            if s is None or s.ready_s is not None: return
+            s.ready_s = time.perf_counter() - s.started
+            self.latency[s.mode].append(s.ready_s)
+        self.on_event("ready", s)
+
+    def _exited(self, key, code):
+        with self.lock:
+            s = self.running.pop(key, None)
+        if s is None: return
+        s.duration_s, s.exit_code = time.perf_counter() - s.started, code
+        self.on_event("exit", s)
+
+    # --- SPAWN MODE ---
+    def _launch_spawned(self, path, name):
+        s = Session(name, path, "spawn")
+        cmd = [sys.executable, os.path.abspath(__file__), "--run", os.path.abspath(path)]
+        if os.name == "posix":
+            r, w = os.pipe()
+            try: proc = subprocess.Popen(cmd + [str(w)], cwd=os.path.dirname(os.path.abspath(path)), pass_fds=(w,))
+            finally: os.close(w)
+        else:
+            r, proc = None, subprocess.Popen(cmd, cwd=os.path.dirname(os.path.abspath(path)))
+        s.pid = proc.pid
+        key = ("spawn", proc.pid)
+        with self.lock: self.running[key] = s
+        threading.Thread(target=self._watch_spawned, args=(key, proc, r), daemon=True).start()
+        return s
+
+    def _watch_spawned(self, key, proc, r):
+        # Reaps the child; without a ready pipe (Windows) ready is "process created"
+        if r is None:
+            self._ready(key)
+        else:
+            with os.fdopen(r, "rb") as f:
+                if f.read(1): self._ready(key)
+        self._exited(key, proc.wait())
+
+    # --- FORK SERVER MODE ---
+    def _ensure_server(self):
+        if self.server and self.server.poll() is None: return True
+        try:
+            self.server = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--fork-server"],
+                                           stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1)
+        except OSError:
+            self.use_fork = False
+            return False
+        threading.Thread(target=self._read_server, args=(self.server,), daemon=True).start()
+        return True
+
+    def _launch_forked(self, path, name):
+        s = Session(name, path, "fork")
+        with self.lock:
+            self.next_id += 1
+            key = ("fork", self.next_id)
+            self.running[key] = s
+        try:
+            self.server.stdin.write(json.dumps({"id": self.next_id, "path": os.path.abspath(path)}) + "\n")
+            self.server.stdin.flush()
+        except OSError:
+            # Server died: fall back to a normal launch
+            with self.lock: self.running.pop(key, None)
+            self.server = None
+            return self._launch_spawned(path, name)
+        return s
+
+    def _read_server(self, server):
+        for line in server.stdout:
+            try: msg = json.loads(line)
+            except ValueError: continue
+            key = ("fork", msg.get("id"))
+            if msg.get("event") == "ready":
+                with self.lock:
+                    if key in self.running: self.running[key].pid = msg.get("pid")
+                self._ready(key)
+            elif msg.get("event") == "exit":
+                self._exited(key, msg.get("code"))
+        # Server gone: whatever it was tracking can't be followed any more
+        with self.lock: orphans = [k for k in self.running if k[0] == "fork"]
+        for key in orphans: self._exited(key, None)
+
+
+# --- CHILD SIDE ---
+def run_game(path, ready_fd=None):
+    """Runs a .py game as __main__ after signalling ready."""
+    if ready_fd is not None:
+        os.write(ready_fd, b"R"); os.close(ready_fd)
+    sys.argv = [path]
+    sys.path.insert(0, os.path.dirname(path))
+    runpy.run_path(path, run_name="__main__")
+
+
+def fork_server():
+    """Pre-warmed interpreter: reads {"id", "path"} lines on stdin, forks one child per game and
+    reports {"event": "ready"/"exit", ...} lines on stdout. Single-threaded so forking is safe."""
+    import importlib
+    import selectors
+    for mod in PREWARM_MODULES + OPTIONAL_PREWARM:
+        try: importlib.import_module(mod)
+        except Exception: pass
+    out = sys.stdout
+    children = {}  # pid -> request id
+
+    def report(**msg):
+        out.write(json.dumps(msg) + "\n"); out.flush()
+
+    def start(req):
+        rid, path = req["id"], req["path"]
+        pid = os.fork()
+        if pid:
+            children[pid] = rid; return
+        code = 0
+        try:
+            report(event="ready", id=rid, pid=os.getpid())
+            # The game gets the server's stderr as its console, not the protocol pipes
+            devnull = os.open(os.devnull, os.O_RDONLY)
+            os.dup2(devnull, 0); os.dup2(2, 1)
+            sys.stdin = open(os.devnull, "r")
+            os.chdir(os.path.dirname(path))
+            run_game(path)
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except BaseException:
+            import traceback; traceback.print_exc(); code = 1
+        finally:
+            try: sys.stdout.flush(); sys.stderr.flush()
+            except Exception: pass
+            os._exit(code)
+
+    # Raw reads, not sys.stdin.readline(): buffered lines would be invisible to select()
+    sel = selectors.DefaultSelector()
+    sel.register(0, selectors.EVENT_READ)
+    buf, stdin_open = b"", True
+    while stdin_open or children:
+        if stdin_open:
+            if sel.select(timeout=0.2):
+                chunk = os.read(0, 65536)
+                if chunk: buf += chunk
+                else: stdin_open = False; sel.unregister(0)
+        else:
+            time.sleep(0.2)
+        while b"\n" in buf:
+            line, buf = buf.split(b"\n", 1)
+            try: start(json.loads(line))
+            except (ValueError, KeyError, TypeError): continue
+        while children:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0: break
+            report(event="exit", id=children.pop(pid, None), code=os.waitstatus_to_exitcode(status))
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--fork-server"]:
+        fork_server()
+    elif sys.argv[1:2] == ["--run"]:
+        run_game(sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else None)
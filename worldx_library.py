@@ -0,0 +1,352 @@
+import bisect
+import json
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+
+from worldx_settings import write_atomic, dump_compact
+
+# --- LIBRARY CATALOG ---
+# One in-memory index of the TV / game / trash folders. A folder is only rescanned (os.scandir)
+# when its own mtime moves, so a click on a station costs one stat instead of a listdir plus
+# a stat per file. The index is saved to disk so a restart with unchanged folders scans nothing.
+
+Entry = namedtuple("Entry", "name ext size mtime_ns ino")
+CatalogDiff = namedtuple("CatalogDiff", "folder added removed changed")
+
+
+class LibraryCatalog:
+    def __init__(self, folders, cache_path=None):
+        self.cache_path = cache_path
+        self.lock = threading.RLock()
+        self.listeners = []
+        self.dirty = False
+        # folder -> {"mtime_ns": folder mtime at last scan, "entries": {name: Entry}, "version": n}
+        self.folders = {f: {"mtime_ns": None, "entries": {}, "version": 0} for f in folders}
+        if cache_path: self.load()
+
+    # --- PERSISTENCE ---
+    def load(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f: data = json.load(f)
+        except (OSError, ValueError): return
+        for folder, saved in data.items():
+            if folder not in self.folders: continue
+            try:
+                entries = {name: Entry(name, os.path.splitext(name)[1].lower(), *vals) for name, vals in saved["entries"].items()}
+            except (KeyError, TypeError, AttributeError): continue
+            # mtime_ns stays None: files rewritten in place (or still being copied at the last scan)
+            # don't touch the folder mtime, so the first refresh re-stats every entry
+            self.folders[folder].update(entries=entries)
+
+    def save(self):
+        if not self.cache_path or not self.dirty: return
+        with self.lock:
+            data = {folder: {"entries": {e.name: [e.size, e.mtime_ns, e.ino] for e in st["entries"].values()}}
+                    for folder, st in self.folders.items()}
+            self.dirty = False
+        write_atomic(self.cache_path, dump_compact(data))
+
+    # --- SCANNING ---
+    def subscribe(self, callback):
+        """callback(CatalogDiff) runs after any refresh that found changes, on whichever thread refreshed."""
+        self.listeners.append(callback)
+
+    def invalidate(self, folder):
+        # For changes we made ourselves; folder mtimes can be too coarse to notice them
+        with self.lock: self.folders[folder]["mtime_ns"] = None
+
+    def refresh(self, folder, force=False):
+        """Rescans folder if it changed since the last scan. Returns a CatalogDiff, or None if unchanged."""
+        state = self.folders[folder]
+        try: mtime_ns = os.stat(folder).st_mtime_ns
+        except OSError: mtime_ns = None
+        if not force and mtime_ns is not None and mtime_ns == state["mtime_ns"]: return None
+        # The scan itself runs unlocked so a slow (network) folder never blocks readers of the cache
+        old, new = state["entries"], {}
+        try:
+            with os.scandir(folder) as it:
+                for d in it:
+                    try:
+                        if not d.is_file(): continue
+                        st = d.stat()
+                    except OSError: continue
+                    prev = old.get(d.name)
+                    if prev and prev.size == st.st_size and prev.mtime_ns == st.st_mtime_ns and prev.ino == st.st_ino:
+                        new[d.name] = prev
+                    else:
+                        new[d.name] = Entry(d.name, os.path.splitext(d.name)[1].lower(), st.st_size, st.st_mtime_ns, st.st_ino)
+        except OSError: pass
+        with self.lock:
+            old = state["entries"]
+            added = [n for n in new if n not in old]
+            removed = [n for n in old if n not in new]
+            changed = [n for n in new if n in old and new[n] is not old[n]]
+            state["mtime_ns"] = mtime_ns
+            if not (added or removed or changed): return None
+            state["entries"] = new
+            state["version"] += 1
+            self.dirty = True
+            diff = CatalogDiff(folder, added, removed, changed)
+        for cb in self.listeners: cb(diff)
+        return diff
+
+    def recent_changed(self, folder, window_ns):
+        """True if a file modified within window_ns of now has changed since the last scan. Writing to a
+        file (a download or copy still in progress) doesn't move the folder mtime, so poll() checks these."""
+        cutoff = time.time_ns() - window_ns
+        with self.lock: recent = [e for e in self.folders[folder]["entries"].values() if e.mtime_ns >= cutoff]
+        for e in recent:
+            try: st = os.stat(os.path.join(folder, e.name))
+            except OSError: return True
+            if (st.st_size, st.st_mtime_ns, st.st_ino) != (e.size, e.mtime_ns, e.ino): return True
+        return False
+
+    def poll(self, deep=False, recent_ns=None):
+        """Cheap watcher tick: one stat per folder, rescans only the ones that moved. recent_ns also
+        re-stats files modified that recently; deep=True re-stats every file."""
+        return [d for d in (self.refresh(f, force=deep or (recent_ns is not None and self.recent_changed(f, recent_ns)))
+                            for f in self.folders) if d]
+
+    # --- QUERIES ---
+    def entries(self, folder, refresh=True):
+        if refresh: self.refresh(folder)
+        with self.lock: return dict(self.folders[folder]["entries"])
+
+    def version(self, folder):
+        return self.folders[folder]["version"]
+
+    def files(self, folder, exts=None, refresh=True):
+        """Names in folder (optionally only the given extensions), A-Z."""
+        entries = self.entries(folder, refresh).values()
+        return sorted((e.name for e in entries if exts is None or e.ext in exts), key=str.lower)
+
+    def illegal(self, folder, allowed_exts):
+        return sorted((e.name for e in self.entries(folder).values() if e.ext not in allowed_exts), key=str.lower)
+
+
+# --- CONTRABAND SCANNER ---
+class ContrabandScanner:
+    """Finds illegal files. Only files that are new (or changed) since the previous scan of a folder
+    are examined, so repeat visits to a station cost nothing; files already found illegal keep being
+    reported while they're still there. Safe to run on a worker thread."""
+
+    def __init__(self, catalog, classifier=None):
+        self.catalog = catalog
+        self.classifier = classifier
+        self.seen = {}     # folder -> {name: (size, mtime_ns)}
+        self.flagged = {}  # folder -> {name: Entry} known illegal
+        self.lock = threading.Lock()
+
+    def is_illegal(self, folder, entry, allowed_exts):
+        if entry.ext not in allowed_exts: return True
+        # Approved extension, but is it really that kind of file? (e.g. a renamed .txt posing as .mp4)
+        return self.classifier is not None and not self.classifier.matches_ext(
+            os.path.join(folder, entry.name), entry.ext, entry.size, entry.mtime_ns, entry.ino)
+
+    def scan(self, folder, allowed_exts):
+        """Returns (CatalogDiff or None, [illegal Entry, ...])."""
+        diff = self.catalog.refresh(folder)
+        entries = self.catalog.entries(folder, refresh=False)
+        with self.lock:
+            seen = self.seen.setdefault(folder, {})
+            fresh = [e for e in entries.values() if seen.get(e.name) != (e.size, e.mtime_ns)]
+            self.seen[folder] = {e.name: (e.size, e.mtime_ns) for e in entries.values()}
+        fresh_names = {e.name for e in fresh}
+        illegal = {e.name: e for e in fresh if self.is_illegal(folder, e, allowed_exts)}
+        with self.lock:
+            # Still there and not re-examined: still illegal (ignored, or its move failed)
+            for name, e in self.flagged.get(folder, {}).items():
+                if name in entries and name not in fresh_names: illegal[name] = entries[name]
+            self.flagged[folder] = dict(illegal)
+        return diff, sorted(illegal.values(), key=lambda e: e.name.lower())
+
+    def flagged_names(self, folder):
+        with self.lock: return set(self.flagged.get(folder, ()))
+
+
+# --- SEARCH INDEX ---
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Case-insensitive substring search. Queries of 3+ chars only look at names sharing all their trigrams."""
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.lower = [n.lower() for n in self.names]
+        self.grams = {}
+        for i, n in enumerate(self.lower):
+            for g in trigrams(n): self.grams.setdefault(g, set()).add(i)
+
+    def search(self, query, candidates=None):
+        """Returns the set of matching positions, optionally only among candidates."""
+        q = query.lower()
+        if candidates is None:
+            if len(q) >= 3:
+                postings = sorted((self.grams.get(g, set()) for g in trigrams(q)), key=len)
+                candidates = set.intersection(*postings) if postings[0] else set()
+            else:
+                candidates = range(len(self.lower))
+        return {i for i in candidates if q in self.lower[i]}
+
+
+# --- QUARANTINE VIEW ---
+class QuarantineView:
+    """Sorted, searchable view of a catalog folder. Both sort orders are precomputed per folder version,
+    and a query that extends the previous one only filters the previous hits."""
+
+    def __init__(self, catalog, folder):
+        self.catalog = catalog
+        self.folder = folder
+        self.version = None
+
+    def _sync(self):
+        self.catalog.refresh(self.folder)
+        version = self.catalog.version(self.folder)
+        if version == self.version: return
+        with self.catalog.lock: entries = list(self.catalog.folders[self.folder]["entries"].values())
+        self.index = TrigramIndex(e.name for e in entries)
+        by_newest = sorted(range(len(entries)), key=lambda i: entries[i].mtime_ns, reverse=True)
+        by_name = sorted(range(len(entries)), key=lambda i: self.index.lower[i])
+        self.orders = {True: by_newest, False: by_name}
+        self.ranks = {k: {i: r for r, i in enumerate(order)} for k, order in self.orders.items()}
+        self.last_query, self.last_hits = None, None
+        self.version = version
+
+    def query(self, text="", newest=True):
+        self._sync()
+        q = text.lower()
+        if not q:
+            return [self.index.names[i] for i in self.orders[newest]]
+        if self.last_query is not None and self.last_query in q:
+            hits = self.index.search(q, self.last_hits)
+        else:
+            hits = self.index.search(q)
+        self.last_query, self.last_hits = q, hits
+        rank = self.ranks[newest]
+        return [self.index.names[i] for i in sorted(hits, key=rank.__getitem__)]
+
+
+# --- ADDRESS BAR INDEX ---
+ADDRESS = re.compile(r"^\s*(TV|GAME)\b\s*(.*)$", re.I)
+NUMBER = re.compile(r"[0-9]+")
+
+
+def is_number(text):
+    # str.isdigit() also accepts digits like "²" that int() rejects
+    return text.isascii() and text.isdigit()
+
+
+class TitleIndex:
+    """What the address bar searches: title numbers ("TV 1942"), name prefixes and fuzzy names for the
+    TV and game folders. Built once from the catalog and then patched from its diffs, so typing never
+    touches the disk. sections: {"TV": (folder, exts), "GAME": (folder, exts)}."""
+
+    STOP_GRAM = 5000  # trigrams shared by more titles than this don't help fuzzy ranking
+
+    def __init__(self, catalog, sections):
+        self.sections = sections
+        self.lock = threading.Lock()
+        self.numbers = {s: {} for s in sections}   # section -> {number: set(names)}
+        self.sorted = {s: [] for s in sections}    # section -> sorted [(lowercase title, name)]
+        self.grams = {s: {} for s in sections}     # section -> {trigram of ' title ': set(names)}
+        self.folder_section = {folder: s for s, (folder, exts) in sections.items()}
+        # Subscribe first: a diff racing the initial build is harmless since adds are idempotent
+        catalog.subscribe(self.on_diff)
+        for s, (folder, exts) in sections.items():
+            self.update(s, [e.name for e in catalog.entries(folder, refresh=False).values()], [])
+
+    @staticmethod
+    def title(name):
+        return os.path.splitext(name)[0].lower()
+
+    def on_diff(self, diff):
+        s = self.folder_section.get(diff.folder)
+        if s: self.update(s, diff.added, diff.removed)
+
+    def update(self, section, added, removed):
+        exts = self.sections[section][1]
+        with self.lock:
+            nums, order, grams = self.numbers[section], self.sorted[section], self.grams[section]
+            for name in removed:
+                t = self.title(name)
+                i = bisect.bisect_left(order, (t, name))
+                if i < len(order) and order[i] == (t, name): del order[i]
+                for n in NUMBER.findall(t): nums.get(int(n), set()).discard(name)
+                for g in trigrams(f" {t} "): grams.get(g, set()).discard(name)
+            for name in added:
+                if os.path.splitext(name)[1].lower() not in exts: continue
+                t = self.title(name)
+                i = bisect.bisect_left(order, (t, name))
+                if i < len(order) and order[i] == (t, name): continue
+                order.insert(i, (t, name))
+                for n in NUMBER.findall(t): nums.setdefault(int(n), set()).add(name)
+                for g in trigrams(f" {t} "): grams.setdefault(g, set()).add(name)
+
+    def _section_query(self, text):
+        m = ADDRESS.match(text)
+        if m: return [m.group(1).upper()], m.group(2).strip().lower()
+        return list(self.sections), text.strip().lower()
+
+    def resolve(self, text):
+        """(section, name) the address points at, or None. Only unambiguous hits count: a title number
+        used by exactly one title ("TV 1942"), an exact title, or a prefix of exactly one title. Substring and fuzzy matches only
+        ever show up as suggestions, so a typo can't open (or run) some other title."""
+        m = ADDRESS.match(text)
+        if not m: return None
+        s, q = m.group(1).upper(), m.group(2).strip().lower()
+        if not q: return None
+        with self.lock:
+            if is_number(q):
+                names = self.numbers[s].get(int(q), ())
+                if len(names) == 1: return s, next(iter(names))
+            order = self.sorted[s]
+            i = bisect.bisect_left(order, (q,))
+            prefix = [name for t, name in order[i:i + 2] if t.startswith(q)]
+            if prefix and (len(prefix) == 1 or order[i][0] == q): return s, prefix[0]
+        return None
+
+    def suggest(self, text, limit=8):
+        """Ranked [(section, name)]: title number, then exact title, prefix, substring, fuzzy."""
+        sections, q = self._section_query(text)
+        if not q: return []
+        ranked, seen = [], set()
+        def add(section, names):
+            for name in sorted(names, key=str.lower):
+                if (section, name) not in seen:
+                    seen.add((section, name)); ranked.append((section, name))
+        with self.lock:
+            for s in sections:
+                if is_number(q): add(s, self.numbers[s].get(int(q), ()))
+                order = self.sorted[s]
+                i = bisect.bisect_left(order, (q,))
+                prefix = []
+                while i < len(order) and order[i][0].startswith(q) and len(prefix) < limit:
+                    prefix.append(order[i][1]); i += 1
+                add(s, [n for n in prefix if self.title(n) == q])
+                add(s, prefix)
+            if len(ranked) >= limit: return ranked[:limit]
+            qg = trigrams(q)
+            for s in sections:
+                postings = sorted((self.grams[s].get(g, set()) for g in qg), key=len)
+                if postings and postings[0]:
+                    add(s, [n for n in set.intersection(*postings) if q in self.title(n)][:limit])
+            if len(ranked) >= limit: return ranked[:limit]
+            # Fuzzy: titles sharing the most trigrams with the query; the padded word edges still
+            # match when the middle of a word is misspelled ("tertis" -> "tetris")
+            qg = trigrams(f" {q} ")
+            scored = []
+            for s in sections:
+                counts = {}
+                for g in qg:
+                    posting = self.grams[s].get(g, ())
+                    if len(posting) > self.STOP_GRAM: continue
+                    for n in posting: counts[n] = counts.get(n, 0) + 1
+                scored += [(-c, n.lower(), s, n) for n, c in counts.items() if c * 3 >= len(qg)]
+            for c, _, s, n in sorted(scored)[:limit]:
+                add(s, [n])
+        return ranked[:limit]
@@ -0,0 +1,196 @@
+import json
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from worldx_settings import write_atomic, dump_compact
+
+# --- MP4 METADATA ---
+# Walks the box (atom) tree with seeks, reading only box headers and the few small boxes that
+# hold duration / size / codec. Works whether moov sits before or after mdat and never touches
+# the media payload or the big sample tables.
+
+CODEC_NAMES = {
+    "avc1": "H.264", "avc3": "H.264", "hvc1": "H.265", "hev1": "H.265", "av01": "AV1", "vp09": "VP9",
+    "mp4v": "MPEG-4", "mp4a": "AAC", "ac-3": "AC-3", "ec-3": "E-AC-3", "Opus": "Opus", ".mp3": "MP3",
+}
+
+
+def boxes(f, start, end):
+    """Yields (type, body_start, body_end) for each box between start and end."""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        hdr = f.read(8)
+        if len(hdr) < 8: return
+        size, typ = struct.unpack(">I4s", hdr)
+        hlen = 8
+        if size == 1:
+            ext = f.read(8)
+            if len(ext) < 8: return
+            size, hlen = struct.unpack(">Q", ext)[0], 16
+        elif size == 0:
+            size = end - pos
+        if size < hlen: return
+        yield typ, pos + hlen, min(pos + size, end)
+        pos += size
+
+
+def find_box(f, start, end, path):
+    """Body range of the first box along path (e.g. [b"mdia", b"hdlr"]), or None."""
+    for typ, s, e in boxes(f, start, end):
+        if typ == path[0]:
+            return (s, e) if len(path) == 1 else find_box(f, s, e, path[1:])
+    return None
+
+
+def read_body(f, span, limit=256):
+    f.seek(span[0])
+    return f.read(min(span[1] - span[0], limit))
+
+
+def probe(path):
+    """Returns {"duration", "width", "height", "video_codec", "audio_codec", "size"} or None if not an MP4."""
+    with open(path, "rb") as f:
+        end = os.fstat(f.fileno()).st_size
+        moov = find_box(f, 0, end, [b"moov"])
+        if moov is None: return None
+        info = {"duration": None, "width": None, "height": None, "video_codec": None, "audio_codec": None, "size": end}
+        for typ, s, e in boxes(f, *moov):
+            if typ == b"mvhd":
+                b = read_body(f, (s, e), 32)
+                if b[:1] == b"\x01" and len(b) >= 32: scale, dur = struct.unpack(">IQ", b[20:32])
+                elif len(b) >= 20: scale, dur = struct.unpack(">II", b[12:20])
+                else: continue
+                if scale: info["duration"] = dur / scale
+            elif typ == b"trak":
+                hdlr = find_box(f, s, e, [b"mdia", b"hdlr"])
+                handler = read_body(f, hdlr, 12)[8:12] if hdlr else b""
+                stsd = find_box(f, s, e, [b"mdia", b"minf", b"stbl", b"stsd"])
+                fourcc = read_body(f, stsd, 16)[12:16].decode("latin-1") if stsd else ""
+                codec = CODEC_NAMES.get(fourcc, fourcc or None)
+                if handler == b"vide" and info["video_codec"] is None:
+                    info["video_codec"] = codec
+                    tkhd = find_box(f, s, e, [b"tkhd"])
+                    if tkhd:
+                        b = read_body(f, tkhd, 104)
+                        if len(b) >= 84:
+                            w, h = struct.unpack(">II", b[-8:])
+                            info["width"], info["height"] = w >> 16, h >> 16
+                elif handler == b"soun" and info["audio_codec"] is None:
+                    info["audio_codec"] = codec
+        return info
+
+
+def describe(info):
+    """Short caption for a TV card, e.g. '3:07 | 1920x1080 | H.264 | 48.2 MB'."""
+    parts = []
+    if info.get("duration") is not None:
+        m, s = divmod(int(info["duration"]), 60)
+        parts.append(f"{m // 60}:{m % 60:02d}:{s:02d}" if m >= 60 else f"{m}:{s:02d}")
+    if info.get("width"): parts.append(f"{info['width']}x{info['height']}")
+    if info.get("video_codec"): parts.append(info["video_codec"])
+    parts.append(f"{info.get('size', 0) / 1048576:.1f} MB")
+    return " | ".join(parts)
+
+
+# --- TV GRID ---
+# Sort keys (entry, metadata) and filters (metadata); files still being probed sort last
+TV_SORTS = {
+    "NAME": lambda e, m: (False, e.name.lower()),
+    "DURATION": lambda e, m: (m.get("duration") is None, -(m.get("duration") or 0)),
+    "SIZE": lambda e, m: (False, -e.size),
+    "RESOLUTION": lambda e, m: (not m.get("height"), -(m.get("height") or 0)),
+}
+TV_FILTERS = {
+    "ALL": lambda m: True,
+    "HD+": lambda m: (m.get("height") or 0) >= 720,
+    "FULL HD+": lambda m: (m.get("height") or 0) >= 1080,
+    "4K": lambda m: (m.get("height") or 0) >= 2160,
+    "H.264": lambda m: m.get("video_codec") == "H.264",
+    "H.265": lambda m: m.get("video_codec") == "H.265",
+}
+
+
+def tv_rows(entries, media, sort="NAME", filt="ALL"):
+    """The TV grid's [(entry, metadata)] after filter and sort; metadata is {} until the file is probed."""
+    keep, key = TV_FILTERS[filt], TV_SORTS[sort]
+    rows = [(e, media.get(e) or {}) for e in entries]
+    rows = [(e, m) for e, m in rows if keep(m)]
+    rows.sort(key=lambda r: key(*r))
+    return rows
+
+
+# --- SIDECAR INDEX ---
+class MediaIndex:
+    """Probe results keyed by file identity, saved next to the other WorldX caches. A redraw is a
+    dict lookup; files not probed yet go to a small worker pool and report back one by one."""
+
+    def __init__(self, path=None, workers=2):
+        self.path = path
+        self.lock = threading.Lock()
+        self.data = {}
+        self.pending = set()
+        self.dirty = False
+        self.version = 0  # bumped whenever data changes, so views can tell their rows are stale
+        self.workers = workers
+        self.pool = None
+        if path: self.load()
+
+    @staticmethod
+    def key(entry):
+        return f"{entry.ino or entry.name}:{entry.size}:{entry.mtime_ns}"
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f: data = json.load(f)
+        except (OSError, ValueError): return
+        if isinstance(data, dict): self.data = data
+
+    def save(self):
+        if not self.path or not self.dirty: return
+        with self.lock:
+            text = dump_compact(self.data)
+            self.dirty = False
+        write_atomic(self.path, text)
+
+    def retain(self, entries):
+        """Drops records for files that are gone or changed."""
+        keep = {self.key(e) for e in entries}
+        with self.lock:
+            stale = [k for k in self.data if k not in keep]
+            for k in stale: del self.data[k]
+            if stale: self.dirty = True; self.version += 1
+
+    def get(self, entry):
+        return self.data.get(self.key(entry))
+
+    def request(self, folder, entries, on_ready):
+        """Probes entries missing from the index in the background; on_ready(entry, info) runs on a worker."""
+        for entry in entries:
+            key = self.key(entry)
+            with self.lock:
+                if key in self.data or key in self.pending: continue
+                self.pending.add(key)
+            if self.pool is None: self.pool = ThreadPoolExecutor(self.workers, thread_name_prefix="mp4probe")
+            self.pool.submit(self._probe, folder, entry, key, on_ready)
+
+    def _probe(self, folder, entry, key, on_ready):
+        try: info = probe(os.path.join(folder, entry.name))
+        except (OSError, struct.error): info = None
+        # Unreadable / non-MP4 files are remembered too, so they're not probed on every redraw
+        info = info or {"size": entry.size}
+        with self.lock:
+            self.data[key] = info
+            self.pending.discard(key)
+            self.dirty = True
+            self.version += 1
+        on_ready(entry, info)
+
+    def busy(self):
+        """True while probes are still queued or running."""
+        with self.lock: return bool(self.pending)
+
+    def shutdown(self):
+        if self.pool: self.pool.shutdown(wait=False, cancel_futures=True)
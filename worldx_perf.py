@@ -0,0 +1,92 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# --- PERF ---
+# Opt-in timing for the hot paths. Off unless WORLDX_PERF=1 or the PERF address-bar command turns it
+# on; while off a span costs one flag check. Every span is appended to a JSONL file (one object per
+# line: ts, name, ms, thread, plus any fields given) and kept in memory for summary().
+
+PERF_FILE = "worldx_perf.jsonl"
+KEEP_SAMPLES = 10000  # per span name, for the percentiles; count/total/max stay exact
+FLUSH_EVERY = 256
+
+
+def percentile(ordered, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered: return 0.0
+    return ordered[min(len(ordered), max(1, math.ceil(p / 100 * len(ordered)))) - 1]
+
+
+class Perf:
+    def __init__(self, path=PERF_FILE, enabled=False):
+        # path=None keeps everything in memory (the benchmark uses it that way)
+        self.path = path
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.stats = {}     # name -> [count, total_ms, max_ms, deque of recent ms]
+            self.counters = {}
+            self.pending = []
+
+    def enable(self, on=True):
+        if not on: self.flush()
+        self.enabled = on
+
+    @contextmanager
+    def span(self, name, **fields):
+        """Times the block under name. Also works as a decorator: @perf.span("history.append")."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try: yield
+        finally: self.record(name, (time.perf_counter() - start) * 1000, **fields)
+
+    def record(self, name, ms, **fields):
+        with self.lock:
+            st = self.stats.get(name)
+            if st is None: st = self.stats[name] = [0, 0.0, 0.0, deque(maxlen=KEEP_SAMPLES)]
+            st[0] += 1; st[1] += ms; st[2] = max(st[2], ms); st[3].append(ms)
+            if self.path:
+                self.pending.append(dict(ts=time.time(), name=name, ms=round(ms, 4), thread=threading.current_thread().name, **fields))
+                if len(self.pending) < FLUSH_EVERY: return
+        if self.path: self.flush()
+
+    def count(self, name, n=1):
+        if not self.enabled: return
+        with self.lock: self.counters[name] = self.counters.get(name, 0) + n
+
+    def flush(self):
+        """Appends the buffered spans to the JSONL file."""
+        with self.lock: lines, self.pending = self.pending, []
+        if not lines or not self.path: return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(line, default=str) + "\n" for line in lines))
+
+    # --- REPORTING ---
+    def summary(self):
+        """{name: {count, total_ms, mean_ms, p50_ms, p95_ms, max_ms}} for every span seen."""
+        with self.lock: stats = {name: (st[0], st[1], st[2], sorted(st[3])) for name, st in self.stats.items()}
+        return {name: {"count": n, "total_ms": total, "mean_ms": total / n, "p50_ms": percentile(ordered, 50),
+                       "p95_ms": percentile(ordered, 95), "max_ms": peak}
+                for name, (n, total, peak, ordered) in stats.items()}
+
+    def format_summary(self):
+        rows = sorted(self.summary().items(), key=lambda kv: -kv[1]["total_ms"])
+        lines = [f"{'SPAN':<28}{'COUNT':>7}{'MEAN':>9}{'P50':>9}{'P95':>9}{'MAX':>9}  (ms)"]
+        lines += [f"{name:<28}{s['count']:>7}{s['mean_ms']:>9.2f}{s['p50_ms']:>9.2f}{s['p95_ms']:>9.2f}{s['max_ms']:>9.2f}"
+                  for name, s in rows]
+        with self.lock: counters = sorted(self.counters.items())
+        if counters: lines += [""] + [f"{name:<28}{n:>7}" for name, n in counters]
+        return "\n".join(lines)
+
+
+perf = Perf(enabled=os.environ.get("WORLDX_PERF") == "1")
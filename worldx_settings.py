@@ -0,0 +1,126 @@
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+from worldx_perf import perf
+
+# --- SETTINGS WRITER ---
+# Every save_settings() just marks the settings dirty. Bursts of saves (opening a station can
+# unlock achievements and log several things back to back) collapse into one write that
+# happens on a short timer or at shutdown.
+
+# The list is defined here, but the display will reverse it so the bottom ones appear on top
+DEFAULT_ACHIEVEMENTS = {
+    "GAMES!!!": False,
+    "TV!!!": False,
+    "I'M A GOOFY GOOBER": False,
+    "YOU'RE UNDER ARREST FOR TRAFFICKING ILLEGAL FILES!!!": False,
+    "NOOB!!!": False,
+    "GARBAGE DAY!!!": False,
+    "IT'S ALIVE!!!": False,
+    "BYE BYE!!!": False,
+    "STALKER!!!": False,
+    "ARE YOU LOST???": False,
+    "COVERING YOUR TRACKS!!!": False,
+    "SORT IT OUT!!!": False,
+    "DOUBLE CLICK!!!": False
+}
+
+
+def write_atomic(path, text):
+    """Writes text to path via temp file + fsync + rename, so a crash never leaves half a file."""
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try: os.remove(tmp)
+        except OSError: pass
+        raise
+    if os.name == "posix":
+        # Make the rename itself durable
+        dfd = os.open(folder, os.O_RDONLY)
+        try: os.fsync(dfd)
+        finally: os.close(dfd)
+    return len(text)
+
+
+def dump_compact(data):
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+class SettingsWriter:
+    def __init__(self, path, delay_ms=250, schedule=None):
+        # schedule(ms, callback) is something like root.after; without one every save flushes right away
+        self.path = path
+        self.delay_ms = delay_ms
+        self.schedule = schedule
+        self.data = None
+        self.dirty = False
+        self.timer_pending = False
+        self.held = 0
+        self.writes_requested = 0
+        self.writes_performed = 0
+        self.bytes_written = 0
+
+    def save(self, data):
+        self.data, self.dirty = data, True
+        self.writes_requested += 1
+        if self.held:
+            return
+        if self.schedule is None:
+            self.flush()
+        elif not self.timer_pending:
+            self.timer_pending = True
+            self.schedule(self.delay_ms, self._on_timer)
+
+    @contextmanager
+    def batch(self):
+        """Every save() inside the block becomes a single write when the block ends."""
+        self.held += 1
+        try: yield
+        finally:
+            self.held -= 1
+            if not self.held and self.dirty: self.flush()
+
+    def _on_timer(self):
+        self.timer_pending = False
+        self.flush()
+
+    def flush(self):
+        """Writes the latest data if anything changed since the last write. Returns True if it wrote."""
+        if not self.dirty: return False
+        with perf.span("settings.write"):
+            self.bytes_written += write_atomic(self.path, dump_compact(self.data))
+        self.dirty = False
+        self.writes_performed += 1
+        return True
+
+    def stats(self):
+        return {"requested": self.writes_requested, "performed": self.writes_performed,
+                "coalesced": self.writes_requested - self.writes_performed, "bytes": self.bytes_written}
+
+
+def load_settings(path, writer):
+    """Reads settings.json, adding any achievements newer than the save file. On first run the
+    defaults are saved through writer; an unreadable file gives the defaults without overwriting it."""
+    if not os.path.exists(path):
+        default = {"tutorial_completed": False, "achievements": dict(DEFAULT_ACHIEVEMENTS)}
+        writer.save(default)
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+            # Merge new achievements if they don't exist in old save file
+            if "achievements" not in data: data["achievements"] = {}
+            for k, v in DEFAULT_ACHIEVEMENTS.items():
+                if k not in data["achievements"]:
+                    data["achievements"][k] = v
+    except (OSError, ValueError, TypeError, AttributeError):
+        return {"tutorial_completed": False, "achievements": dict(DEFAULT_ACHIEVEMENTS)}
+    return data
@@ -0,0 +1,39 @@
+import queue
+import threading
+
+# --- BACKGROUND TASKS ---
+# Tk widgets may only be touched from the main thread. Workers hand their results back through
+# a queue that the main loop drains on a short root.after timer.
+
+
+class UiQueue:
+    def __init__(self, root, interval_ms=50):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.q = queue.SimpleQueue()
+        self.root.after(self.interval_ms, self._pump)
+
+    def post(self, fn, *args):
+        """Thread-safe: fn(*args) will run on the Tk main thread."""
+        self.q.put((fn, args))
+
+    def _pump(self):
+        try:
+            while True:
+                try: fn, args = self.q.get_nowait()
+                except queue.Empty: break
+                fn(*args)
+        finally:
+            self.root.after(self.interval_ms, self._pump)
+
+    def run(self, work, on_done=None, on_error=None):
+        """Runs work() on a daemon thread; on_done(result) / on_error(exc) run back on the main thread."""
+        def target():
+            try: result = work()
+            except Exception as e:
+                if on_error: self.post(on_error, e)
+            else:
+                if on_done: self.post(on_done, result)
+        t = threading.Thread(target=target, daemon=True)
+        t.start()
+        return t
@@ -0,0 +1,245 @@
+import os
+import tkinter as tk
+from tkinter import ttk
+from tkinter import font as tkfont
+
+# --- SHARED WIDGETS ---
+
+
+def grid_window(count, width, height, top, cell_w, cell_h, overscan=1):
+    """Pure layout math for VirtualGrid: (columns, rows, range of item indexes to materialize) for a
+    viewport of width x height scrolled to top. Kept Tk-free so it can be benchmarked headless."""
+    columns = max(1, width // cell_w)
+    rows = -(-count // columns)
+    first_row = max(0, int(top // cell_h) - overscan)
+    last_row = min(rows, int((top + height) // cell_h) + 1 + overscan)
+    return columns, rows, range(first_row * columns, min(count, last_row * columns))
+
+
+class ReviewDialog(tk.Toplevel):
+    """Lists a batch of files for one decision (e.g. every illegal file a scan found) with a progress bar
+    for the bulk action. on_confirm(selected names, dialog) is called when the user accepts."""
+
+    def __init__(self, root, title, message, names, on_confirm, font, font_small, action_text="QUARANTINE SELECTED"):
+        super().__init__(root)
+        self.title(title)
+        self.configure(bg="#d9d9d9")
+        self.geometry("560x480")
+        self.transient(root)
+        self.names = list(names)
+        self.on_confirm = on_confirm
+
+        tk.Label(self, text=message, font=font, fg="red", bg="#d9d9d9", wraplength=520).pack(pady=10)
+        list_frame = tk.Frame(self, bg="white", relief="sunken", borderwidth=2); list_frame.pack(fill="both", expand=True, padx=20)
+        self.lb = tk.Listbox(list_frame, font=font_small, bg="white", borderwidth=0, selectmode="extended")
+        self.lb.pack(side="left", fill="both", expand=True)
+        sb = tk.Scrollbar(list_frame); sb.pack(side="right", fill="y"); self.lb.config(yscrollcommand=sb.set); sb.config(command=self.lb.yview)
+        self.lb.insert(tk.END, *self.names)
+        self.lb.selection_set(0, tk.END)
+
+        sel_f = tk.Frame(self, bg="#d9d9d9"); sel_f.pack(fill="x", padx=20, pady=5)
+        tk.Button(sel_f, text="SELECT ALL", bg="#808080", fg="white", font=font_small, command=lambda: self.lb.selection_set(0, tk.END)).pack(side="left", padx=2)
+        tk.Button(sel_f, text="SELECT NONE", bg="#808080", fg="white", font=font_small, command=lambda: self.lb.selection_clear(0, tk.END)).pack(side="left", padx=2)
+        exts = sorted({os.path.splitext(n)[1].lower() or "(none)" for n in self.names})
+        self.ext_var = tk.StringVar(value=exts[0] if exts else "")
+        if exts:
+            tk.OptionMenu(sel_f, self.ext_var, *exts).pack(side="left", padx=2)
+            tk.Button(sel_f, text="SELECT EXTENSION", bg="#808080", fg="white", font=font_small, command=self.select_ext).pack(side="left", padx=2)
+
+        self.status = tk.Label(self, text=f"{len(self.names)} file(s)", font=font_small, bg="#d9d9d9"); self.status.pack()
+        self.bar = ttk.Progressbar(self, maximum=max(1, len(self.names))); self.bar.pack(fill="x", padx=20, pady=5)
+
+        btn_f = tk.Frame(self, bg="#d9d9d9"); btn_f.pack(pady=10)
+        self.go_btn = tk.Button(btn_f, text=action_text, bg="#ffaa00", font=font_small, command=self.confirm); self.go_btn.pack(side="left", padx=5)
+        self.ignore_btn = tk.Button(btn_f, text="IGNORE", bg="#808080", fg="white", font=font_small, command=self.destroy); self.ignore_btn.pack(side="left", padx=5)
+
+    def select_ext(self):
+        ext = self.ext_var.get()
+        for i, n in enumerate(self.names):
+            if (os.path.splitext(n)[1].lower() or "(none)") == ext: self.lb.selection_set(i)
+
+    def confirm(self):
+        chosen = [self.names[i] for i in self.lb.curselection()]
+        if not chosen: return
+        self.go_btn.config(state="disabled"); self.ignore_btn.config(state="disabled")
+        self.on_confirm(chosen, self)
+
+    def set_progress(self, done, total):
+        if not self.winfo_exists(): return
+        self.bar.config(maximum=max(1, total), value=done)
+        self.status.config(text=f"{done} / {total}")
+
+    def set_cancel(self, callback):
+        """Turns IGNORE into a CANCEL button for the running bulk action."""
+        self.ignore_btn.config(text="CANCEL", state="normal", command=lambda: (callback(), self.ignore_btn.config(state="disabled")))
+
+
+class ProgressDialog(tk.Toplevel):
+    """Progress bar (with CANCEL) for a bulk file operation."""
+
+    def __init__(self, root, title, total, on_cancel, font_small):
+        super().__init__(root)
+        self.title(title)
+        self.configure(bg="#d9d9d9")
+        self.geometry("420x150")
+        self.transient(root)
+        self.protocol("WM_DELETE_WINDOW", lambda: None)
+        self.status = tk.Label(self, text=f"0 / {total}", font=font_small, bg="#d9d9d9"); self.status.pack(pady=10)
+        self.bar = ttk.Progressbar(self, maximum=max(1, total)); self.bar.pack(fill="x", padx=20)
+        self.cancel_btn = tk.Button(self, text="CANCEL", bg="#808080", fg="white", font=font_small,
+                                    command=lambda: (on_cancel(), self.cancel_btn.config(state="disabled")))
+        self.cancel_btn.pack(pady=10)
+
+    set_progress = ReviewDialog.set_progress
+
+
+class VirtualGrid(tk.Frame):
+    """Scrollable grid of cards that only materializes the rows in view (plus overscan). A fixed pool of
+    card widgets is recycled while scrolling, so cost depends on the window size, not on how many items
+    there are. make_card(parent) builds an empty card; bind_card(card, index) fills it for an item.
+    start is the scroll position (0.0-1.0) to open at, e.g. to keep the view across a redraw."""
+
+    def __init__(self, parent, make_card, bind_card, count, card_w=200, card_h=160, pad=15, overscan=1, bg="#f0f0f0", start=0.0):
+        super().__init__(parent, bg=bg)
+        self.make_card, self.bind_card = make_card, bind_card
+        self.count = count
+        self.cell_w, self.cell_h = card_w + 2 * pad, card_h + 2 * pad
+        self.pad, self.overscan = pad, overscan
+        self.columns = 1
+        self.region = None
+        self.start = start
+        self.free = []      # [(card, canvas window id)] not showing anything
+        self.visible = {}   # item index -> (card, canvas window id)
+
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0)
+        self.sb = tk.Scrollbar(self, command=self.canvas.yview)
+        self.sb.pack(side="right", fill="y"); self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.config(yscrollcommand=self.on_scroll)
+        self.canvas.bind("<Configure>", lambda e: self.layout())
+        self.canvas.bind("<Enter>", lambda e: self.bind_wheel(True))
+        self.canvas.bind("<Leave>", self.on_leave)
+        self.bind("<Destroy>", lambda e: self.bind_wheel(False))
+
+    def bind_wheel(self, on):
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            if on: self.canvas.bind_all(seq, self.on_wheel)
+            else: self.canvas.unbind_all(seq)
+
+    def on_leave(self, e):
+        # Moving onto a card also counts as leaving the canvas; keep the wheel while inside the grid
+        w = self.winfo_containing(e.x_root, e.y_root)
+        if w is None or not str(w).startswith(str(self)): self.bind_wheel(False)
+
+    def on_wheel(self, e):
+        step = -1 if (getattr(e, "num", None) == 4 or e.delta > 0) else 1
+        self.canvas.yview_scroll(step, "units")
+
+    def on_scroll(self, first, last):
+        self.sb.set(first, last)
+        self.layout()
+
+    def window(self):
+        """Range of item indexes that should have cards right now."""
+        width, height = max(1, self.canvas.winfo_width()), max(1, self.canvas.winfo_height())
+        self.columns, rows, wanted = grid_window(self.count, width, height, self.canvas.canvasy(0),
+                                                 self.cell_w, self.cell_h, self.overscan)
+        region = (0, 0, width, rows * self.cell_h)
+        if region != self.region:
+            # Only on change: reconfiguring fires yscrollcommand, which lays out again
+            self.region = region
+            self.canvas.config(scrollregion=region, yscrollincrement=self.cell_h // 4)
+            if self.start and width > 1:
+                self.canvas.yview_moveto(self.start); self.start = None
+            wanted = grid_window(self.count, width, height, self.canvas.canvasy(0), self.cell_w, self.cell_h, self.overscan)[2]
+        return wanted
+
+    def layout(self):
+        wanted = self.window()
+        for i in [i for i in self.visible if i not in wanted]:
+            card, win = self.visible.pop(i)
+            self.canvas.itemconfigure(win, state="hidden")
+            self.free.append((card, win))
+        x0 = max(0, (self.canvas.winfo_width() - self.columns * self.cell_w) // 2) + self.pad
+        for i in wanted:
+            if i in self.visible:
+                card, win = self.visible[i]
+            else:
+                if self.free:
+                    card, win = self.free.pop()
+                    self.canvas.itemconfigure(win, state="normal")
+                else:
+                    card = self.make_card(self.canvas)
+                    win = self.canvas.create_window(0, 0, window=card, anchor="nw")
+                self.bind_card(card, i)
+                self.visible[i] = (card, win)
+            row, col = divmod(i, self.columns)
+            self.canvas.coords(win, x0 + col * self.cell_w, self.pad + row * self.cell_h)
+
+    def refresh_item(self, index):
+        """Re-binds one item if its card is on screen (e.g. its caption changed)."""
+        if index in self.visible: self.bind_card(self.visible[index][0], index)
+
+
+class LazyListView(tk.Frame):
+    """Listbox that only ever holds the rows in view. fetch(offset, limit) returns [(text, color or None)]
+    for that window and count() the total, so a million-row list opens as fast as a ten-row one."""
+
+    def __init__(self, parent, fetch, count, font, bg="white"):
+        super().__init__(parent, bg=bg)
+        self.fetch, self.count = fetch, count
+        self.top, self.total = 0, count()
+        self.line_h = tkfont.Font(font=font).metrics("linespace") + 1
+        self.lb = tk.Listbox(self, font=font, bg=bg, borderwidth=0, activestyle="none", exportselection=False)
+        self.sb = tk.Scrollbar(self, command=self.on_scrollbar)
+        self.sb.pack(side="right", fill="y"); self.lb.pack(side="left", fill="both", expand=True)
+        self.lb.bind("<Configure>", lambda e: self.render())
+        for seq, step in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "page-"), ("<Next>", "page+")):
+            self.lb.bind(seq, lambda e, s=step: self.on_key(s))
+        self.lb.bind("<Home>", lambda e: self.scroll_to(0) or "break")
+        self.lb.bind("<End>", lambda e: self.scroll_to(self.total) or "break")
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"): self.lb.bind(seq, self.on_wheel)
+
+    def page_size(self):
+        return max(1, self.lb.winfo_height() // self.line_h)
+
+    def render(self):
+        n = self.page_size()
+        self.top = max(0, min(self.top, self.total - n))
+        rows = self.fetch(self.top, n) if self.total else []
+        self.lb.delete(0, tk.END)
+        if rows: self.lb.insert(tk.END, *[text for text, color in rows])
+        for i, (text, color) in enumerate(rows):
+            if color: self.lb.itemconfigure(i, fg=color)
+        if self.total: self.sb.set(self.top / self.total, min(1.0, (self.top + n) / self.total))
+        else: self.sb.set(0, 1)
+        # The font metric is only an estimate of the row pitch; correct it from the real rows once
+        if len(rows) >= 2:
+            b0, b1 = self.lb.bbox(0), self.lb.bbox(1)
+            if b0 and b1 and b1[1] - b0[1] > 0 and b1[1] - b0[1] != self.line_h:
+                self.line_h = b1[1] - b0[1]
+                self.render()
+
+    def reload(self):
+        self.total = self.count()
+        self.render()
+
+    def scroll_to(self, index, select=False):
+        self.top = index
+        self.render()
+        if select and 0 <= index - self.top < self.lb.size():
+            self.lb.selection_clear(0, tk.END); self.lb.selection_set(index - self.top)
+
+    def on_scrollbar(self, *args):
+        n = self.page_size()
+        if args[0] == "moveto": self.scroll_to(int(float(args[1]) * self.total))
+        elif args[0] == "scroll": self.scroll_to(self.top + int(args[1]) * (n if args[2] == "pages" else 1))
+
+    def on_wheel(self, e):
+        step = -3 if (getattr(e, "num", None) == 4 or e.delta > 0) else 3
+        self.scroll_to(self.top + step)
+        return "break"
+
+    def on_key(self, step):
+        n = self.page_size()
+        self.scroll_to(self.top + (step if isinstance(step, int) else (-n if step == "page-" else n)))
+        return "break"